@@ -28,6 +28,8 @@
 import os
 import sys
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
 
 # sys.path.insert(0, os.path.abspath(
 #    os.path.join(os.path.dirname(__file__), '..')))
@@ -35,6 +37,13 @@ import numpy as np
 from network2tikz import plot
 
 
+def render(net, visual_style, task):
+    """Compile a single frame of the animation."""
+    filename, labels, opacities = task
+    plot(net, filename, node_label=labels, node_opacity=opacities,
+         **visual_style)
+
+
 def main():
     # Network
     # -------
@@ -80,23 +89,36 @@ def main():
     visual_style['layout'] = layout
     visual_style["canvas"] = (10, 7)
 
-    # create images
+    # Distributions
+    # -------------
+    # one row per step n, with x_{n} = x_{n-1} T
+    steps = 10
+    distributions = np.empty((steps, len(x)))
+    # step 0 is the starting vector itself (T^0 = I), no product needed
+    distributions[0] = x
+    for step in range(1, steps):
+        distributions[step] = distributions[step-1].dot(T)
+
+    # create frames
     # -------------
-    for step in range(10):
+    tasks = []
+    for step, values in enumerate(distributions):
         # create file name for step n
         filename = '{num:02d}_network.pdf'.format(num=step)
 
-        # get distribution for step n
-        values = np.linalg.matrix_power(T, step).transpose().dot(x)
-
         # change node label
-        visual_style['node_label'] = [str(n) for n in np.round(values, 3)]
+        labels = np.char.mod('%.3f', values).tolist()
 
         # change node oppacity
-        visual_style['node_opacity'] = list(values)
-        # Create a latex file
+        opacities = values.tolist()
+
+        tasks.append((filename, labels, opacities))
 
-        plot(net, filename, **visual_style)
+    # create images
+    # -------------
+    # the frames are independent, so compile them in parallel
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        list(executor.map(partial(render, net, visual_style), tasks))
 
 
 if __name__ == '__main__':
@@ -12,23 +12,26 @@
 # =============================================================================
 import numpy as np
 import matplotlib.pyplot as plt
-from scipy.ndimage import imread
+from matplotlib.collections import LineCollection
 from scipy.spatial import cKDTree
-import random
+
+# luma weights used to transform color images to grayscale
+_LUMA = np.array([0.299, 0.587, 0.114], dtype=np.float32)
 
 # function to transform color image to grayscale
 
 
 def rgb2gray(rgb):
-    return np.dot(rgb[..., :3], [0.299, 0.587, 0.114])
+    return np.einsum('...c,c->...',
+                     rgb[..., :3].astype(np.float32, copy=False), _LUMA)
 
 
-def rgb2hex(color):
+def rgb2hex(colors):
     '''
     Matplotlib scatter is not happy with rgb tuples so we need to transform them to hex
     '''
-    c = tuple([np.int(255 if c == 1.0 else c * 256.0) for c in color])
-    return "#%02x%02x%02x" % c
+    rgb = np.where(colors == 1.0, 255, colors * 256.0).astype(np.uint8)
+    return np.array(["#%02x%02x%02x" % tuple(c) for c in rgb.reshape(-1, 3)])
 
 
 # parameters
@@ -36,12 +39,14 @@ p = 0.003  # propability of selecting a pixel/node
 k = 5  # number of connections pre per pixel/node
 # remove values above this value 0 (white) - 255 (black) OR 0 (black) - 1 (white)
 pix_threshold = 0.9
+seed = 0  # seed of the random number generator used to select the nodes
 
 # load image
 data = plt.imread('./data/chicken_in.png')
-y, x = np.where(rgb2gray(data[:, :, :3]) < pix_threshold)
-y_norm, x_norm = map(float, data[:, :, 0].shape)
 colors = data[:, :, :3]
+gray = rgb2gray(colors)
+y, x = np.divmod(np.flatnonzero(gray < pix_threshold), gray.shape[1])
+y_norm, x_norm = map(float, gray.shape)
 
 # if its a large image it might be a good idea to downsample
 # y,x = np.where(rgb2gray(data[::3,::3,:3])<pix_threshold)
@@ -49,29 +54,27 @@ colors = data[:, :, :3]
 # colors = data[::3,::3,:3]
 
 # select nodes
-X = np.array(random.sample(list(zip(x, y)), int(len(y)*p)))*1.0
+rng = np.random.default_rng(seed)
+idx = rng.choice(len(y), size=int(len(y)*p), replace=False)
+# cKDTree works on a contiguous array of doubles
+X = np.ascontiguousarray(np.column_stack((x[idx], y[idx])), dtype=np.float64)
 
 # find k nearest neighbors using scipy.spatial.cKDTree
-tree = cKDTree(X)
+# (a flat, unbalanced tree is faster to build for uniformly sampled 2D points)
+tree = cKDTree(X, leafsize=32, balanced_tree=False, compact_nodes=False)
 # construct figure
 plt.figure(figsize=(x_norm/120., y_norm/120.))
 ax = plt.subplot(111)
 
-# create lists for position of links
-x_ = []
-y_ = []
-
-# go through each node and construct links
-for pt in X:
-    # find k nearest neighbors
-    # k' = k+1 because method returns points itself
-    dist, ind = tree.query(pt, k=k+1)
-    for kneigh in ind[1:]:
-        x_.append([pt[0], X[kneigh][0]])
-        y_.append([pt[1], X[kneigh][1]])
+# find k nearest neighbors for all nodes at once
+# k' = k+1 because method returns points itself
+dist, ind = tree.query(X, k=k+1, workers=-1)
+neighbors = ind[:, 1:]
 
-plt.plot(np.array(x_).T, np.array(y_).T,
-         color='#282828', lw=0.8, alpha=0.4, zorder=2)
+# construct the links as (start, end) segments and draw them as one artist
+segments = np.stack((np.repeat(X, k, axis=0), X[neighbors.ravel()]), axis=1)
+ax.add_collection(LineCollection(segments, colors='#282828', linewidths=0.8,
+                                 alpha=0.4, zorder=2))
 
 # unpack nodes
 # y,x = zip(*X)
@@ -80,7 +83,7 @@ plt.plot(np.array(x_).T, np.array(y_).T,
 # plt.scatter(y,x,marker='o',c='#282828',s=0.5,alpha=1)
 
 # or if you want to draw the network with the original colors of your image
-# c = [rgb2hex(colors[int(xx),int(yy),:]) for yy,xx in X] # colors
+# c = rgb2hex(colors[X[:,1].astype(int),X[:,0].astype(int)]) # colors
 # plt.scatter(y,x,marker='o',c=c,s=3,alpha=1,zorder=3)
 
 plt.axis('off')
@@ -94,19 +97,18 @@ plt.close()
 
 # transforming your network to a latex source file
 from network2tikz import plot
-nodes = {(u, v): 'N{}'.format(i) for i, (u, v) in enumerate(X)}
-edges = [(nodes[x_[i][0], y_[i][0]], nodes[x_[i][1], y_[i][1]])
-         for i in range(len(x_))]
+nodes = ['N{}'.format(i) for i in range(len(X))]
+edges = [(nodes[i], nodes[j]) for i, row in enumerate(neighbors) for j in row]
 
 # add some additional style to your figure
 visual_style = {}
-visual_style['layout'] = {v: (k[0], -k[1]) for k, v in nodes.items()}
+visual_style['layout'] = {n: (u, -v) for n, (u, v) in zip(nodes, X)}
 visual_style['node_size'] = .2
 visual_style['edge_opacity'] = .8
 visual_style['canvas'] = (25, 25)
 
 # create the latex file
-plot((nodes.values(), edges), 'chicken.tex', ** visual_style)
+plot((nodes, edges), 'chicken.tex', ** visual_style)
 
 # =============================================================================
 # eof
@@ -56,6 +56,10 @@ def main():
               4: (12.7, -1.7069), 5: (6.0022, -9.0323),
               6: (9.7608, -12.7)}
 
+    # node styles based on the gender (one pass over all nodes)
+    colors, shapes, styles = map(list, zip(*[
+        (color_dict[g], shape_dict[g], style_dict[g]) for g in net.vs['gender']]))
+
     # Visual style dict
     # -----------------
     visual_style = {}
@@ -63,15 +67,15 @@ def main():
     # node styles
     # -----------
     visual_style['vertex_size'] = 5
-    visual_style['vertex_color'] = [color_dict[g] for g in net.vs['gender']]
+    visual_style['vertex_color'] = colors
     visual_style['vertex_opacity'] = .7
     visual_style['vertex_label'] = net.vs['name']
     visual_style['vertex_label_position'] = 'below'
     visual_style['vertex_label_distance'] = 15
     visual_style['vertex_label_color'] = 'gray'
     visual_style['vertex_label_size'] = 3
-    visual_style['vertex_shape'] = [shape_dict[g] for g in net.vs['gender']]
-    visual_style['vertex_style'] = [style_dict[g] for g in net.vs['gender']]
+    visual_style['vertex_shape'] = shapes
+    visual_style['vertex_style'] = styles
     visual_style['vertex_label_off'] = {4:True} # vertex e
     visual_style['vertex_math_mode'] = [True]
     visual_style['vertex_label_as_id'] = {5:True} # vertex f
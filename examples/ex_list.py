@@ -57,6 +57,10 @@ def main():
               'e': (12.7, -1.7069), 'f': (6.0022, -9.0323),
               'g': (9.7608, -12.7)}
 
+    # node styles based on the gender (one pass over all nodes)
+    colors, shapes, styles = map(list, zip(*[
+        (color_dict[g], shape_dict[g], style_dict[g]) for g in gender]))
+
     # Visual style dict
     # -----------------
     visual_style = {}
@@ -64,15 +68,15 @@ def main():
     # node styles
     # -----------
     visual_style['node_size'] = 5
-    visual_style['node_color'] = [color_dict[g] for g in gender]
+    visual_style['node_color'] = colors
     visual_style['node_opacity'] = .7
     visual_style['node_label'] = name
     visual_style['node_label_position'] = 'below'
     visual_style['node_label_distance'] = 15
     visual_style['node_label_color'] = 'gray'
     visual_style['node_label_size'] = 3
-    visual_style['node_shape'] = [shape_dict[g] for g in gender]
-    visual_style['node_style'] = [style_dict[g] for g in gender]
+    visual_style['node_shape'] = shapes
+    visual_style['node_style'] = styles
     visual_style['node_label_off'] = {'e':True}
     visual_style['node_math_mode'] = [True]
     visual_style['node_label_as_id'] = {'f':True}
@@ -66,6 +66,11 @@ def main():
               'e': (12.7, -1.7069), 'f': (6.0022, -9.0323),
               'g': (9.7608, -12.7)}
 
+    # Network attributes
+    # ------------------
+    gender = nx.get_node_attributes(net,'gender')
+    is_formal = nx.get_edge_attributes(net,'is_formal')
+
     # Visual style dict
     # -----------------
     visual_style = {}
@@ -73,15 +78,15 @@ def main():
     # node styles
     # -----------
     visual_style['vertex_size'] = 5
-    visual_style['vertex_color'] = {n:color_dict[g] for n,g in nx.get_node_attributes(net,'gender').items()}
+    visual_style['vertex_color'] = {n:color_dict[g] for n,g in gender.items()}
     visual_style['vertex_opacity'] = .7
     visual_style['vertex_label'] = nx.get_node_attributes(net,'name')
     visual_style['vertex_label_position'] = 'below'
     visual_style['vertex_label_distance'] = 15
     visual_style['vertex_label_color'] = 'gray'
     visual_style['vertex_label_size'] = 3
-    visual_style['vertex_shape'] = {n:shape_dict[g] for n,g in nx.get_node_attributes(net,'gender').items()}
-    visual_style['vertex_style'] = {n:style_dict[g] for n,g in nx.get_node_attributes(net,'gender').items()}
+    visual_style['vertex_shape'] = {n:shape_dict[g] for n,g in gender.items()}
+    visual_style['vertex_style'] = {n:style_dict[g] for n,g in gender.items()}
     visual_style['vertex_label_off'] = {'e':True}
     visual_style['vertex_math_mode'] = {'a':True}
     visual_style['vertex_label_as_id'] = {'f':True}
@@ -89,7 +94,7 @@ def main():
 
     # edge styles
     # -----------
-    visual_style['edge_width'] = {e:.3 + .3 * int(f) for e,f in nx.get_edge_attributes(net,'is_formal').items()}
+    visual_style['edge_width'] = {e:.3 + .3 * int(f) for e,f in is_formal.items()}
     visual_style['edge_color'] = 'black'
     visual_style['edge_opacity'] = .8
     visual_style['edge_curved'] = 0.1
@@ -11,25 +11,14 @@
 #
 # Description : some additional package information
 #
-# This program is free software: you can redistribute it and/or modify
-# it under the terms of the GNU General Public License as published by
-# the Free Software Foundation, either version 3 of the License, or
-# (at your option) any later version.
-#
-# This program is distributed in the hope that it will be useful,
-# but WITHOUT ANY WARRANTY; without even the implied warranty of
-# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
-# GNU General Public License for more details.
-#
-# You should have received a copy of the GNU General Public License
-# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+# SPDX-License-Identifier: GPL-3.0-or-later
 # =============================================================================
 
 __title__ = 'Network to TikZ'
 __version__ = '0.1.8'
 __author__ = u'Juergen Hackl'
 __email__ = 'hackl.j@gmx.at'
-__copyright__ = u'Copyright (c) 2018, {} <{}>'.format(__author__, __email__)
+__copyright__ = u'Copyright (c) 2018, Juergen Hackl <hackl.j@gmx.at>'
 __license__ = u'License :: OSI Approved :: GNU General Public License v3 (GPLv3)'
 __maintainer__ = u'Juergen Hackl'
 __status__ = 'Development Status :: 4 - Beta'
@@ -11,47 +11,95 @@
 #
 # Description : init file for the package
 #
-# This program is free software: you can redistribute it and/or modify
-# it under the terms of the GNU General Public License as published by
-# the Free Software Foundation, either version 3 of the License, or
-# (at your option) any later version.
-#
-# This program is distributed in the hope that it will be useful,
-# but WITHOUT ANY WARRANTY; without even the implied warranty of
-# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
-# GNU General Public License for more details.
-#
-# You should have received a copy of the GNU General Public License
-# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+# SPDX-License-Identifier: GPL-3.0-or-later
 # =============================================================================
 
-from .__about__ import(
-    __title__,
-    __version__,
-    __author__,
-    __email__,
-    __copyright__,
-    __license__,
-    __maintainer__,
-    __status__,
-    __credits__
-)
+import os
+import sys
+from functools import lru_cache
+from types import ModuleType
+
+__all__ = ['Plot', 'plot', 'layout', 'logger']
+
+# package information provided by the __about__ module
+_ABOUT_NAMES = frozenset(['__title__', '__version__', '__author__',
+                          '__email__', '__copyright__', '__license__',
+                          '__maintainer__', '__status__', '__credits__'])
+
+# names which are only loaded on first access
+_LAZY = frozenset(['Plot', 'plot', 'layout']) | _ABOUT_NAMES
 
-import logging
+# logging levels accepted by the logger function (values of the logging module)
+_LEVELS = {'DEBUG': 10, 'INFO': 20, 'WARNING': 30, 'ERROR': 40, 'CRITICAL': 50}
 
 
+@lru_cache(maxsize=None)
 def logger(name, level='INFO'):
-    """A function to generate logger for the modules."""
+    """A function to generate logger for the modules.
+
+    The loggers are cached, i.e. the level is only set on the first call
+    for a given name and level.
+
+    """
+    # logging is only needed once a module asks for a logger
+    import logging
     # initialize new logger
     logger = logging.getLogger(name)
     # set logger level
-    logger.setLevel(logging._nameToLevel[level])
+    logger.setLevel(_LEVELS[level])
     return logger
 
 
-from .plot import Plot
-from .layout import layout
-plot = Plot()
+def __getattr__(name):
+    """Load the package information, plot and layout on first access."""
+    if name not in _LAZY:
+        raise AttributeError('module {!r} has no attribute {!r}'
+                             ''.format(__name__, name))
+
+    if name in _ABOUT_NAMES:
+        from . import __about__
+        value = getattr(__about__, name)
+    elif name == 'Plot':
+        from .plot import Plot as value
+    elif name == 'plot':
+        from .plot import Plot
+        value = Plot()
+    else:
+        from .layout import layout as value
+
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """Return the names of the package including the lazy loaded ones."""
+    return sorted(set(globals()).union(__all__, _LAZY))
+
+
+class _Package(ModuleType):
+    """Package module keeping plot and layout bound to the public objects.
+
+    Importing a submodule binds it to the package namespace (whenever it is
+    imported, e.g. ``from network2tikz.plot import Plot``), which would
+    shadow the functions named like their modules. These bindings are
+    ignored, i.e. ``plot`` and ``layout`` are always the ``Plot()``
+    instance and the layout function.
+
+    """
+
+    def __setattr__(self, name, value):
+        if name in ('plot', 'layout') and isinstance(value, ModuleType):
+            return
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _Package
+
+
+# load everything at import time if requested (e.g. to debug import errors)
+if os.environ.get('EAGER_IMPORT', ''):
+    for _name in _LAZY:
+        __getattr__(_name)
 
 # =============================================================================
 # eof
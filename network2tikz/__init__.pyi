@@ -0,0 +1,27 @@
+# =============================================================================
+# File      : __init__.pyi
+#
+# Description : Type stub of the package, listing the lazy loaded names
+# =============================================================================
+from logging import Logger
+
+from .__about__ import (
+    __title__ as __title__,
+    __version__ as __version__,
+    __author__ as __author__,
+    __email__ as __email__,
+    __copyright__ as __copyright__,
+    __license__ as __license__,
+    __maintainer__ as __maintainer__,
+    __status__ as __status__,
+    __credits__ as __credits__,
+)
+from .plot import Plot as Plot
+from .layout import layout as layout
+
+__all__ = ['Plot', 'plot', 'layout', 'logger']
+
+plot: Plot
+
+
+def logger(name: str, level: str = ...) -> Logger: ...
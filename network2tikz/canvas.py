@@ -24,6 +24,7 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 # =============================================================================
+import numpy as np
 from . import logger
 from .exceptions import CnetError
 log = logger(__name__)
@@ -236,11 +237,12 @@ class Canvas(object):
 
         Parameters
         ----------
-        layout : dict
+        layout : dict or numpy.ndarray
             A dictionary with the node positions on a 2-dimensional plane. The
             key value of the dict represents the node id while the value
             represents a tuple of coordinates (e.g. n = (x,y)). The initial
             layout can be placed anywhere on the 2-dimensional plane.
+            Alternatively, the positions can be given as (n, 2) array.
 
         keep_aspect_ratio : bool, optional (default = True)
             Defines whether to keep the aspect ratio of the current layout. If
@@ -251,10 +253,11 @@ class Canvas(object):
 
         Returns
         -------
-        layout : dict
+        layout : dict or numpy.ndarray
             Returns a dictionary with the new node positions. Key values
             represents the node ids and the values are the new coordinates. The
-            new coordinates are shifted and transformed from its origins.
+            new coordinates are shifted and transformed from its origins. If
+            the positions were given as array, an array is returned.
 
         Examples
         --------
@@ -278,11 +281,15 @@ class Canvas(object):
         height = self.height
         margins = self.margins()
 
+        # node positions as (n, 2) array
+        if isinstance(layout, dict):
+            points = np.array(list(layout.values()), dtype=float)
+        else:
+            points = np.asarray(layout, dtype=float)
+
         # find min and max values of the points
-        min_x = min(layout.items(), key=lambda item: item[1][0])[1][0]
-        max_x = max(layout.items(), key=lambda item: item[1][0])[1][0]
-        min_y = min(layout.items(), key=lambda item: item[1][1])[1][1]
-        max_y = max(layout.items(), key=lambda item: item[1][1])[1][1]
+        min_x, min_y = points.min(axis=0)
+        max_x, max_y = points.max(axis=0)
 
         # calculate the scaling ratio
         ratio_x = float('inf')
@@ -304,17 +311,11 @@ class Canvas(object):
             scaling = (scaling[0], 1)
 
         # apply scaling to the points
-        _layout = {}
-        for n, (x, y) in layout.items():
-            _x = (x)*scaling[0]
-            _y = (y)*scaling[1]
-            _layout[n] = (_x, _y)
+        points = points * scaling
 
         # find min and max values of new the points
-        min_x = min(_layout.items(), key=lambda item: item[1][0])[1][0]
-        max_x = max(_layout.items(), key=lambda item: item[1][0])[1][0]
-        min_y = min(_layout.items(), key=lambda item: item[1][1])[1][1]
-        max_y = max(_layout.items(), key=lambda item: item[1][1])[1][1]
+        min_x, min_y = points.min(axis=0)
+        max_x, max_y = points.max(axis=0)
 
         # calculate the translation
         translation = (((width-margins['left']-margins['right'])/2
@@ -323,12 +324,11 @@ class Canvas(object):
                         + margins['bottom']) - ((max_y-min_y)/2 + min_y))
 
         # apply translation to the points
-        for n, (x, y) in _layout.items():
-            _x = (x)+translation[0]
-            _y = (y)+translation[1]
-            _layout[n] = (_x, _y)
+        points += translation
 
-        return _layout
+        if isinstance(layout, dict):
+            return dict(zip(layout, map(tuple, points.tolist())))
+        return points
 
 # =============================================================================
 # eof
@@ -11,32 +11,87 @@
 #
 # Description : Module to draw the network
 #
-# This program is free software: you can redistribute it and/or modify
-# it under the terms of the GNU General Public License as published by
-# the Free Software Foundation, either version 3 of the License, or
-# (at your option) any later version.
-#
-# This program is distributed in the hope that it will be useful,
-# but WITHOUT ANY WARRANTY; without even the implied warranty of
-# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
-# GNU General Public License for more details.
-#
-# You should have received a copy of the GNU General Public License
-# along with this program.  If not, see <http://www.gnu.org/licenses/>.
+# SPDX-License-Identifier: GPL-3.0-or-later
 # =============================================================================
 
+import weakref
 import numpy as np
-from collections import OrderedDict
+from functools import lru_cache
+from itertools import chain
 from . import logger
-from .exceptions import CnetError
+from .exceptions import CnetError, CnetNotImplemented
 from .units import UnitConverter
 from .canvas import Canvas
-from .layout import Layout
+from .layout import Layout, _freeze, _matrix_digest, _network_type
 log = logger(__name__)
 
 # TODO: move this to the config file
 DIGITS = 3
 
+# attributes with units given as (attributes, key, converter, divisor, suffix)
+CONVERSIONS = (
+    ('node_attributes', 'node_size', 'unit2cm', None, None),
+    ('node_attributes', 'node_label_distance', 'unit2cm', None, None),
+    ('node_attributes', 'node_label_size', 'unit2pt', 7, None),
+    ('edge_attributes', 'edge_arrow_size', 'unit2cm', None, None),
+    ('edge_attributes', 'edge_arrow_width', 'unit2cm', None, None),
+    ('edge_attributes', 'edge_width', 'unit2pt', None, None),
+    ('edge_attributes', 'edge_loop_size', 'unit2cm', None, 'cm'),
+    ('edge_attributes', 'edge_label_size', 'unit2pt', 7, None),
+)
+
+# prefixes of the attribute names and their unique key words (longest first,
+# so that e.g. 'margins' is not taken for 'margin' + 's')
+ALIASES = tuple(sorted({
+    'vertex_': 'node_',
+    'v_': 'node_',
+    'n_': 'node_',
+    'edge_': 'edge_',
+    'link_': 'edge_',
+    'l_': 'edge_',
+    'e_': 'edge_',
+    'margins': 'margins',
+    'margin': 'margins',
+    'bbox': 'canvas',
+    'figure_size': 'canvas',
+    'units': 'units',
+    'unit': 'units',
+}.items(), key=lambda item: -len(item[0])))
+
+# number of nodes or edges after which the sharing of their styles is stopped
+# if most of them have an individual style
+STYLE_SAMPLE = 1000
+
+# drawings which are still in use (e.g. by the plot function), so that drawing
+# the same network again only changes the output
+_DRAWING_CACHE = weakref.WeakValueDictionary()
+
+# readers for the supported network types keyed by their top level module
+NETWORK_TYPES = {
+    'cnet': '_from_cnet',
+    'networkx': '_from_networkx',
+    'igraph': '_from_igraph',
+    'pathpy': '_from_pathpy',
+}
+
+
+@lru_cache(maxsize=32)
+def _unit_converter(input_unit, output_unit):
+    """Returns a (shared) unit converter for the given units."""
+    return UnitConverter(input_unit, output_unit)
+
+
+def _rgb(color):
+    """Returns the tikz-network string of a RGB color tuple."""
+    return '{{{},{},{}}}'.format(color[0], color[1], color[2])
+
+
+def _rgb_used(attributes, prefix):
+    """Returns True if RGB colors are given for the nodes or edges."""
+    return any(isinstance(value, tuple)
+               for key in [prefix + '_color', prefix + '_label_color']
+               for value in attributes.get(key, {}).values())
+
 
 class TikzNetworkDrawer(object):
     """Class which handles the drawing of the network.
@@ -77,7 +132,7 @@ class TikzNetworkDrawer(object):
 
         """
         # initialize variables
-        self.edges = OrderedDict()
+        self.edges = {}
         self.nodes = None
         self.directed = False
         self.digits = DIGITS
@@ -100,55 +155,14 @@ class TikzNetworkDrawer(object):
             _weight = kwds.get('layout_weight', None)
 
         # check type of network
-        if 'cnet' in str(type(network)):
-            # log.debug('The network is of type "cnet".')
-            for e, n in network.edges(nodes=True):
-                self.edges[e] = n
-            self.nodes = list(network.nodes)
-            self.directed = network.directed
-            if _layout:
-                self.adjacency_matrix = network.adjacency_matrix(weight=_weight)
-
-        elif 'networkx' in str(type(network)):
-            # log.debug('The network is of type "networkx".')
-            for e in network.edges():
-                self.edges[e] = e
-            self.nodes = list(network.nodes())
-            self.directed = network.is_directed()
-            if _layout:
-                import networkx as nx
-                self.adjacency_matrix = nx.adjacency_matrix(
-                    network, weight=_weight)
-
-        elif 'igraph' in str(type(network)):
-            # log.debug('The network is of type "igraph".')
-            for i in range(len(network.es)):
-                self.edges[i] = network.es[i].tuple
-            self.nodes = list(range(len(network.vs)))
-            self.directed = network.is_directed()
-            if _layout:
-                from scipy.sparse import coo_matrix
-                A = np.array(network.get_adjacency(attribute=_weight).data)
-                self.adjacency_matrix = coo_matrix(A)
-
-        elif 'pathpy' in str(type(network)):
-            # log.debug('The network is of type "pathpy".')
-            for e in network.edges:
-                self.edges[e] = e
-            self.nodes = list(network.nodes)
-            self.directed = network.directed
-            if _layout:
-                if _weight is not None:
-                    _w = True
-                else:
-                    _w = False
-                self.adjacency_matrix = network.adjacency_matrix(weighted=_w)
+        _type = _network_type(network)
+        if _type in NETWORK_TYPES:
+            getattr(self, NETWORK_TYPES[_type])(network, _layout, _weight)
 
         elif isinstance(network, tuple):
             # log.debug('The network is of type "list".')
             self.nodes = network[0]
-            for e in network[1]:
-                self.edges[e] = e
+            self.edges = {e: e for e in network[1]}
 
         else:
             log.error('Type of the network could not be determined.'
@@ -158,8 +172,94 @@ class TikzNetworkDrawer(object):
 
         # assign attributes to the class
         self.attributes = kwds
-        # draw the network in the memory
-        self.draw()
+
+        # reuse the drawing of an unchanged network with the same attributes
+        key = self._drawing_key()
+        drawing = _DRAWING_CACHE.get(key) if key is not None else None
+        if drawing is not None:
+            self.__dict__.update(drawing.__dict__)
+        else:
+            # draw the network in the memory
+            self.draw()
+        # the latest drawer keeps the drawing in the cache, since the previous
+        # one is usually released (e.g. by the next call of the plot function)
+        if key is not None:
+            _DRAWING_CACHE[key] = self
+
+    def _drawing_key(self):
+        """Returns the cache key of the drawing or None if not cachable.
+
+        Drawings with a random layout (i.e. a generated layout without seed)
+        are not cached.
+
+        """
+        _layout = self.attributes.get('layout', None)
+        _seed = self.attributes.get('seed',
+                                    self.attributes.get('layout_seed', None))
+        if (_layout is None or isinstance(_layout, str)) and _seed is None:
+            return None
+        key = (tuple(self.nodes), _freeze(self.edges), self.directed,
+               _matrix_digest(self.adjacency_matrix), _freeze(self.attributes))
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def _from_cnet(self, network, layout, weight):
+        """Read the nodes and edges of a 'cnet' network."""
+        self.edges = dict(network.edges(nodes=True))
+        self.nodes = list(network.nodes)
+        self.directed = network.directed
+        if layout:
+            # build the sparse matrix from the edges read above
+            from scipy.sparse import coo_matrix
+            _index = {n: i for i, n in enumerate(self.nodes)}
+            _m = len(self.edges)
+            row = np.fromiter((_index[u] for u, _ in self.edges.values()),
+                              dtype=np.int32, count=_m)
+            col = np.fromiter((_index[v] for _, v in self.edges.values()),
+                              dtype=np.int32, count=_m)
+            if weight is None:
+                data = np.ones(_m)
+            else:
+                data = np.fromiter(network.weights(weight=weight),
+                                   dtype=float, count=_m)
+            if not self.directed:
+                row, col = np.concatenate((row, col)), np.concatenate((col, row))
+                data = np.concatenate((data, data))
+            _n = len(self.nodes)
+            self.adjacency_matrix = coo_matrix((data, (row, col)),
+                                               shape=(_n, _n))
+
+    def _from_networkx(self, network, layout, weight):
+        """Read the nodes and edges of a 'networkx' network."""
+        self.edges = {e: e for e in network.edges()}
+        self.nodes = list(network.nodes())
+        self.directed = network.is_directed()
+        if layout:
+            import networkx as nx
+            self.adjacency_matrix = nx.adjacency_matrix(network, weight=weight)
+
+    def _from_igraph(self, network, layout, weight):
+        """Read the nodes and edges of an 'igraph' network."""
+        # the edge list is read at once, i.e. without an object per edge
+        self.edges = dict(enumerate(network.get_edgelist()))
+        self.nodes = list(range(len(network.vs)))
+        self.directed = network.is_directed()
+        if layout:
+            from scipy.sparse import coo_matrix
+            A = np.array(network.get_adjacency(attribute=weight).data)
+            self.adjacency_matrix = coo_matrix(A)
+
+    def _from_pathpy(self, network, layout, weight):
+        """Read the nodes and edges of a 'pathpy' network."""
+        self.edges = {e: e for e in network.edges}
+        self.nodes = list(network.nodes)
+        self.directed = network.directed
+        if layout:
+            self.adjacency_matrix = network.adjacency_matrix(
+                weighted=weight is not None)
 
     @staticmethod
     def rename_attributes(**kwds):
@@ -181,26 +281,21 @@ class TikzNetworkDrawer(object):
         ========= ===========================
 
         """
-        names = {'node_': ['vertex_', 'v_', 'n_'],
-                 'edge_': ['edge_', 'link_', 'l_', 'e_'],
-                 'margins': ['margin'],
-                 'canvas': ['bbox', 'figure_size'],
-                 'units': ['units', 'unit'],
-                 }
-        _kwds = {}
-        del_keys = []
+        renamed = {}
+        kept = {}
         for key, value in kwds.items():
-            for attr, name_list in names.items():
-                for name in name_list:
-                    if name in key and name[0] == key[0]:
-                        _kwds[key.replace(name, attr)] = value
-                        del_keys.append(key)
-                        break
-        # remove the replaced keys from the dict
-        for key in del_keys:
-            del kwds[key]
-
-        return {**_kwds, **kwds}
+            name = key
+            for old, new in ALIASES:
+                if key.startswith(old):
+                    name = new + key[len(old):]
+                    break
+            if name == key:
+                kept[key] = value
+            else:
+                renamed[name] = value
+
+        # attributes given with the unique key word take precedence
+        return {**renamed, **kept}
 
     def draw(self):
         """Function to draw a virtual network."""
@@ -210,9 +305,9 @@ class TikzNetworkDrawer(object):
         # go through all attributes and assign them to nodes, edges or the
         # general dictionary
         for key, value in kwds.items():
-            if 'node_' in key:
+            if key.startswith('node_'):
                 self.node_attributes[key] = self.format_node_value(value)
-            elif 'edge_' in key:
+            elif key.startswith('edge_'):
                 self.edge_attributes[key] = self.format_edge_value(value)
             # elif 'layout_' in key:
             #     if 'fixed' in key or 'positions' in key:
@@ -248,18 +343,20 @@ class TikzNetworkDrawer(object):
         _layout = self.attributes.get('layout', None)
         if isinstance(_layout, str) or _layout is None:
             self.general_attributes['layout'] = _layout
-            self.layout = Layout(self.nodes, self.adjacency_matrix,
-                                 **self.general_attributes).generate_layout()
+            _nodes = self.nodes
+            _points = self.generate_layout(Layout(
+                self.nodes, self.adjacency_matrix, **self.general_attributes))
         else:
             self.layout = self.format_node_value(self.attributes['layout'])
+            _nodes = list(self.layout)
+            _points = list(self.layout.values())
 
         # self.layout = {}
         # for node in self.nodes:
         #     self.layout[node] = (np.random.rand(), np.random.rand())
 
         # fit the node position to the chosen canvas
-        k_a_r = self.general_attributes.get('keep_aspect_ratio', True)
-        self.layout = self.canvas.fit(self.layout, keep_aspect_ratio=k_a_r)
+        self.layout = self._fit_layout(_nodes, _points)
 
         # assign layout to the nodes
         self.node_attributes['layout'] = self.layout
@@ -268,93 +365,294 @@ class TikzNetworkDrawer(object):
         if self.edge_attributes.get('edge_curved', None) is not None:
             self.edge_attributes['edge_curved'] = self.curve()
 
-        # initialize vertices
-        self.node_drawer = []
-        for node in self.nodes:
-            _attr = {}
-            for key in self.node_attributes:
-                _attr[key] = self.node_attributes[key][node]
-            self.node_drawer.append(TikzNodeDrawer(node, **_attr))
-
-        # initialize edges
-        self.edge_drawer = []
-        for edge, (u, v) in self.edges.items():
-            _attr = {}
-            for key in self.edge_attributes:
-                _attr[key] = self.edge_attributes[key][edge]
-            self.edge_drawer.append(TikzEdgeDrawer(edge, u, v, **_attr))
+        # the tikz-network code is generated on the first request (and shared
+        # with the drawers reusing this drawing)
+        self._code = {}
+
+    def _fit_layout(self, nodes, points):
+        """Returns the positions of the nodes fitted to the canvas."""
+        k_a_r = self.general_attributes.get('keep_aspect_ratio', True)
+        points = np.array(points, dtype=float)
+        points = self.canvas.fit(points, keep_aspect_ratio=k_a_r)
+        return dict(zip(nodes, map(tuple, points.tolist())))
+
+    def update_positions(self, positions):
+        """Move the nodes to new positions.
+
+        Only the node positions are updated, i.e. the styles of the nodes and
+        the code of the edges are not formatted again.
+
+        Parameters
+        ----------
+        positions : dict
+            New positions of the nodes given as for the option ``layout``,
+            i.e. the positions are fitted to the canvas.
+
+        """
+        positions = self.format_node_value(positions)
+        self.layout = self._fit_layout(list(positions),
+                                       list(positions.values()))
+
+        # the drawing is not shared anymore with other drawers, i.e. it is
+        # removed from the cache together with the code of the old positions
+        for key, drawing in list(_DRAWING_CACHE.items()):
+            if drawing is self:
+                del _DRAWING_CACHE[key]
+        self.node_attributes = dict(self.node_attributes, layout=self.layout)
+        self._code = {k: v for k, v in self._code.items() if k != 'tex'}
+
+    def iter_node_drawers(self):
+        """Yield a :py:class:`TikzNodeDrawer` for every node.
+
+        The drawers are created on the fly, i.e. only one drawer is kept in
+        the memory while writing the output and every call starts with fresh
+        (not yet modified) drawers.
+
+        """
+        _keys = tuple(self.node_attributes)
+        _columns = [map(self.node_attributes[key].__getitem__, self.nodes)
+                    for key in _keys]
+        for node, *values in zip(self.nodes, *_columns):
+            yield TikzNodeDrawer(node, **dict(zip(_keys, values)))
+
+    def iter_edge_drawers(self):
+        """Yield a :py:class:`TikzEdgeDrawer` for every edge.
+
+        See also :py:meth:`iter_node_drawers`
+
+        """
+        _keys = tuple(self.edge_attributes)
+        _columns = [map(self.edge_attributes[key].__getitem__, self.edges)
+                    for key in _keys]
+        for (edge, (u, v)), *values in zip(self.edges.items(), *_columns):
+            yield TikzEdgeDrawer(edge, u, v, **dict(zip(_keys, values)))
+
+    def iter_node_tex(self):
+        """Yield the tikz-network code for every node.
+
+        If no RGB colors are used, the code is formatted directly from the
+        node attributes, without creating a :py:class:`TikzNodeDrawer` for
+        every node. Otherwise the node drawers are used.
+
+        """
+        if _rgb_used(self.node_attributes, 'node'):
+            for node in self.iter_node_drawers():
+                yield node.draw()
+            return
+
+        # the options are kept, since they do not change with the positions
+        _options = self._code.get('node_options', None)
+        if _options is None:
+            _options = self._style_options(TikzNodeDrawer,
+                                           self.node_attributes, self.nodes)
+            self._code['node_options'] = _options
+
+        _position = TikzNodeDrawer.TEX_POSITION.format
+        for node, options in zip(self.nodes, _options):
+            yield '{}{}]{{{}}}\n'.format(_position(*self.layout[node]),
+                                         options, node)
+
+    def iter_edge_tex(self):
+        """Yield the tikz-network code for every edge.
+
+        See also :py:meth:`iter_node_tex`. The edge drawers are used if RGB
+        colors or arrow sizes are defined, since these change the options of
+        the single edges.
+
+        """
+        if _rgb_used(self.edge_attributes, 'edge') or \
+           'edge_arrow_size' in self.edge_attributes:
+            for edge in self.iter_edge_drawers():
+                yield edge.draw()
+            return
+
+        _options = self._style_options(TikzEdgeDrawer,
+                                       self.edge_attributes, self.edges)
+        for (u, v), options in zip(self.edges.values(), _options):
+            yield '\\Edge[{}]({})({})\n'.format(options, u, v)
+
+    @staticmethod
+    def _style_options(drawer, attributes, keys):
+        """Returns the tikz-network options of the given nodes or edges.
+
+        Elements with the same attribute values share their style, i.e. the
+        options of every distinct style are only formatted once.
+
+        """
+        # the option templates are built once for all elements
+        _kwds = [(',{}={{}}'.format(tikz).format, attributes[k])
+                 for k, tikz in drawer.TIKZ_KWDS if k in attributes]
+        _args = [(',' + tikz, attributes[k])
+                 for k, tikz in drawer.TIKZ_ARGS if k in attributes]
+        _columns = [values for _, values in _kwds + _args]
+
+        def _options(key):
+            parts = []
+            for _format, values in _kwds:
+                if values[key] is not None:
+                    parts.append(_format(values[key]))
+            for tikz, values in _args:
+                if values[key] == True:
+                    parts.append(tikz)
+            return ''.join(parts)
+
+        # the styles are shared as long as they repeat, i.e. for elements
+        # with (mostly) individual values they are formatted directly
+        styles = {}
+        options = []
+        keys = iter(keys)
+        for key in keys:
+            style = tuple([values[key] for values in _columns])
+            # the types are part of the key, since e.g. 1 == 1.0 == True
+            style = (style, tuple(map(type, style)))
+            try:
+                _style = styles.get(style, None)
+            except TypeError:
+                # unhashable values are formatted for every element
+                _style = style = None
+            if _style is None:
+                _style = _options(key)
+                if style is not None:
+                    styles[style] = _style
+            options.append(_style)
+            if len(options) >= STYLE_SAMPLE and \
+               2 * len(styles) > len(options):
+                options.extend(map(_options, keys))
+                break
+        return options
+
+    def iter_node_csv(self, head=True):
+        """Yield the rows of the node list.
+
+        If `head` is True, the header of the list is yielded first. As for
+        :py:meth:`iter_node_tex`, the node drawers are only used if RGB
+        colors are defined.
+
+        """
+        if _rgb_used(self.node_attributes, 'node') or \
+           'node_rgb' in self.node_attributes:
+            for node in self.iter_node_drawers():
+                if head:
+                    yield node.head()
+                    head = False
+                yield node.draw(mode='csv')
+            return
+
+        _position = TikzNodeDrawer.CSV_POSITION.format
+        rows = ((node, _position(node, *self.layout[node]))
+                for node in self.nodes)
+        yield from self._iter_csv(TikzNodeDrawer, self.node_attributes,
+                                  'id,x,y' if head else None, rows)
+
+    def iter_edge_csv(self, head=True):
+        """Yield the rows of the edge list.
+
+        See also :py:meth:`iter_node_csv`
+
+        """
+        if _rgb_used(self.edge_attributes, 'edge') or \
+           'edge_rgb' in self.edge_attributes:
+            for edge in self.iter_edge_drawers():
+                if head:
+                    yield edge.head()
+                    head = False
+                yield edge.draw(mode='csv')
+            return
+
+        rows = ((edge, '{},{}'.format(u, v))
+                for edge, (u, v) in self.edges.items())
+        yield from self._iter_csv(TikzEdgeDrawer, self.edge_attributes,
+                                  'u,v' if head else None, rows)
+
+    @staticmethod
+    def _iter_csv(drawer, attributes, head, rows):
+        """Yield the header (if not None) and the rows of a csv list.
+
+        The rows are given as (key, prefix) pairs, where the prefix contains
+        the first columns (i.e. the id and the position of a node) and the key
+        is used to look up the values of the attributes.
+
+        """
+        _kwds = [attributes[k] for k, _ in drawer.TIKZ_KWDS
+                 if k in attributes]
+        _args = [attributes[k] for k, _ in drawer.TIKZ_ARGS
+                 if k in attributes]
+        if head is not None:
+            parts = [head]
+            parts.extend(',' + tikz for k, tikz in drawer.TIKZ_KWDS
+                         if k in attributes)
+            parts.extend(',' + tikz for k, tikz in drawer.TIKZ_ARGS
+                         if k in attributes)
+            parts.append('\n')
+            yield ''.join(parts)
+
+        for key, prefix in rows:
+            parts = [prefix]
+            for values in _kwds:
+                value = values[key]
+                parts.append(', ' if value is None else ',{}'.format(value))
+            for values in _args:
+                parts.append(',true' if values[key] == True else ',false')
+            parts.append('\n')
+            yield ''.join(parts)
+
+    def tex(self):
+        """Returns the tikz-network code of all nodes and edges.
+
+        The code is generated once per drawing and reused afterwards, e.g.
+        when the same network is saved as tex and as pdf file. The code of
+        the edges is also kept if the nodes are moved, see
+        :py:meth:`update_positions`.
+
+        """
+        if 'edges' not in self._code:
+            self._code['edges'] = ''.join(self.iter_edge_tex())
+        if 'tex' not in self._code:
+            self._code['tex'] = ''.join(chain(self.iter_node_tex(),
+                                              (self._code['edges'],)))
+        return self._code['tex']
+
+    @property
+    def node_drawer(self):
+        """Returns a list with the drawers of the nodes."""
+        return list(self.iter_node_drawers())
+
+    @property
+    def edge_drawer(self):
+        """Returns a list with the drawers of the edges."""
+        return list(self.iter_edge_drawers())
 
     def convert_units(self):
         """Function to convert the units used."""
         # get unit converter
         _units = self.general_attributes.get('units', ('cm', 'pt'))
         if isinstance(_units, tuple):
-            self.unit2cm = UnitConverter(_units[0], 'cm')
-            self.unit2pt = UnitConverter(_units[1], 'pt')
+            self.unit2cm = _unit_converter(_units[0], 'cm')
+            self.unit2pt = _unit_converter(_units[1], 'pt')
         else:
-            self.unit2cm = UnitConverter(_units, 'cm')
-            self.unit2pt = UnitConverter(_units, 'pt')
-
-        # TODO: Fix this ugly code!
-        for key in ['node_size', 'node_label_distance']:
-            if key in self.node_attributes:
-                _attr = {}
-                for k, v in self.node_attributes[key].items():
-                    if isinstance(v, int) or isinstance(v, float):
-                        _attr[k] = self.unit2cm(v)
-                    else:
-                        _attr[k] = v
-                self.node_attributes[key] = _attr
-
-        for key in ['node_label_size']:
-            if key in self.node_attributes:
-                _attr = {}
-                for k, v in self.node_attributes[key].items():
-                    if isinstance(v, int) or isinstance(v, float):
-                        _attr[k] = round(self.unit2pt(v)/7, self.digits)
-                    else:
-                        _attr[k] = v
-                self.node_attributes[key] = _attr
-
-        for key in ['edge_arrow_size', 'edge_arrow_width']:
-            if key in self.edge_attributes:
-                _attr = {}
-                for k, v in self.edge_attributes[key].items():
-                    if isinstance(v, int) or isinstance(v, float):
-                        _attr[k] = self.unit2cm(v)
-                    else:
-                        _attr[k] = v
-                self.edge_attributes[key] = _attr
-
-        for key in ['edge_width']:
-            if key in self.edge_attributes:
-                _attr = {}
-                for k, v in self.edge_attributes[key].items():
-                    if isinstance(v, int) or isinstance(v, float):
-                        _attr[k] = self.unit2pt(v)
-                    else:
-                        _attr[k] = v
-                self.edge_attributes[key] = _attr
-
-        for key in ['edge_loop_size']:
-            if key in self.edge_attributes:
-                _attr = {}
-                for k, v in self.edge_attributes[key].items():
-                    if isinstance(v, int) or isinstance(v, float):
-                        _attr[k] = str(self.unit2cm(v))+'cm'
-                    else:
-                        _attr[k] = v
-                self.edge_attributes[key] = _attr
-
-        for key in ['edge_label_size']:
-            if key in self.edge_attributes:
-                _attr = {}
-                for k, v in self.edge_attributes[key].items():
-                    if isinstance(v, int) or isinstance(v, float):
-                        _attr[k] = round(self.unit2pt(v)/7, self.digits)
-                    else:
-                        _attr[k] = v
-                self.edge_attributes[key] = _attr
+            self.unit2cm = _unit_converter(_units, 'cm')
+            self.unit2pt = _unit_converter(_units, 'pt')
+
+        for attributes, key, converter, divisor, suffix in CONVERSIONS:
+            _attr = getattr(self, attributes).get(key, None)
+            if _attr is None:
+                continue
+            _convert = getattr(self, converter)
+            # every distinct value is only converted once (uniform values,
+            # e.g. given as scalar, are converted a single time)
+            _converted = {}
+            for k, v in _attr.items():
+                if isinstance(v, (int, float)):
+                    _key = (type(v), v)
+                    _v = _converted.get(_key, None)
+                    if _v is None:
+                        _v = _convert(v)
+                        if divisor is not None:
+                            _v = round(_v/divisor, self.digits)
+                        if suffix is not None:
+                            _v = str(_v)+suffix
+                        _converted[_key] = _v
+                    _attr[k] = _v
 
         if 'canvas' in self.general_attributes:
             w, h = self.general_attributes['canvas']
@@ -379,78 +677,64 @@ class TikzNetworkDrawer(object):
 
     def format_node_value(self, value):
         """Returns a dict with node ids and assigned values."""
-        # check if value is string, list or dict
-        _values = {}
-        if isinstance(value, str) or isinstance(value, int) or \
-           isinstance(value, float) or isinstance(value, tuple):
-            for n in self.nodes:
-                _values[n] = value
-        elif isinstance(value, list):
-            for i, n in enumerate(self.nodes):
-                try:
-                    _values[n] = value[i]
-                except:
-                    _values[n] = None
-        elif isinstance(value, dict):
-            for n in self.nodes:
-                try:
-                    _values[n] = value[n]
-                except:
-                    _values[n] = None
-        else:
-            log.error('Something went wrong, by formatting the node values!')
-            raise CnetError
-        return _values
+        return self._format_value(value, self.nodes, 'node')
 
     def format_edge_value(self, value):
         """Returns a dict with edge ids and assigned values."""
+        return self._format_value(value, self.edges, 'edge')
+
+    @staticmethod
+    def _format_value(value, keys, kind):
+        """Returns a dict with the given keys and assigned values."""
+        # numpy arrays and scalars are used as lists and python values, so
+        # that they are formatted in the same way
+        if isinstance(value, (np.ndarray, np.generic)):
+            value = value.tolist()
         # check if value is string, list or dict
-        _values = {}
-        if isinstance(value, str) or isinstance(value, int) or \
-           isinstance(value, float) or isinstance(value, bool) \
-           or isinstance(value, tuple):
-            for n in self.edges:
-                _values[n] = value
+        if isinstance(value, (str, int, float, tuple)):
+            _values = dict.fromkeys(keys, value)
         elif isinstance(value, list):
-            for i, n in enumerate(self.edges):
-                try:
-                    _values[n] = value[i]
-                except:
-                    _values[n] = None
+            # missing values are set to None
+            _values = dict.fromkeys(keys)
+            _values.update(zip(keys, value))
         elif isinstance(value, dict):
-            for n in self.edges:
-                try:
-                    _values[n] = value[n]
-                except:
-                    _values[n] = None
+            _values = {n: value.get(n) for n in keys}
         else:
-            log.error('Something went wrong, by formatting the edge values!')
+            log.error('Something went wrong, by formatting the {} values!'
+                      ''.format(kind))
             raise CnetError
         return _values
 
+    def generate_layout(self, layout):
+        """Returns the node positions of the layout as (n, d) array.
+
+        Seeded layouts are kept in a small cache (see
+        :py:meth:`Layout.generate_layout_array`), so that drawing the same
+        network again (e.g. as tex and as pdf) does not recompute the layout.
+        The cache is bypassed with the option ``layout_cache=False``.
+
+        """
+        return layout.generate_layout_array()
+
     def curve(self):
         """Calculate the bend factor for curved edges."""
-        if 'edge_curved' in self.edge_attributes:
-            _curved = {}
-            for key, value in self.edge_attributes['edge_curved'].items():
-                curved = value
+        _curved = self.edge_attributes.get('edge_curved', {})
+        # edges without a value (e.g. not given in a dict) are not bent
+        _keys = [key for key, value in _curved.items() if value is not None]
+        curved = np.fromiter(map(_curved.__getitem__, _keys), dtype=float,
+                             count=len(_keys))
 
-                if curved == 0:
-                    _curved[key] = 0
-                else:
-                    v1 = np.array([0, 0])
-                    v2 = np.array([1, 1])
-                    v3 = np.array([(2*v1[0]+v2[0]) / 3.0 - curved * 0.5 * (v2[1]-v1[1]),
-                                   (2*v1[1]+v2[1]) / 3.0 +
-                                   curved * 0.5 * (v2[0]-v1[0])
-                                   ])
-                    vec1 = v2-v1
-                    vec2 = v3 - v1
-                    angle = np.rad2deg(np.arccos(
-                        np.dot(vec1, vec2) / np.sqrt((vec1*vec1).sum()) / np.sqrt((vec2*vec2).sum())))
-                    _curved[key] = np.round(
-                        np.sign(curved) * angle * -1, self.digits)
-        return _curved
+        # the bend angle is the angle between the straight edge (0,0)->(1,1)
+        # and the vector to the control point v3 of the curved edge
+        x = 1/3.0 - curved * 0.5
+        y = 1/3.0 + curved * 0.5
+        angle = np.rad2deg(np.arccos((x + y) / np.sqrt(2) / np.sqrt(x*x + y*y)))
+        bend_values = np.round(np.sign(curved) * angle * -1, self.digits)
+
+        bend = dict.fromkeys(_curved)
+        bend.update((key, value if value != 0 else 0) for key, value in
+                    zip(_keys, bend_values.tolist()))
+        return bend
 
 
 class TikzEdgeDrawer(object):
@@ -479,6 +763,36 @@ class TikzEdgeDrawer(object):
 
     """
 
+    # all options from the tikz-network library
+    TIKZ_KWDS = (
+        ('edge_width', 'lw'),
+        ('edge_color', 'color'),
+        ('edge_r', 'R'),
+        ('edge_g', 'G'),
+        ('edge_b', 'B'),
+        ('edge_opacity', 'opacity'),
+        ('edge_curved', 'bend'),
+        ('edge_label', 'label'),
+        ('edge_label_position', 'position'),
+        ('edge_label_distance', 'distance'),
+        ('edge_label_color', 'fontcolor'),
+        ('edge_label_size', 'fontscale'),
+        ('edge_style', 'style'),
+        # ('edge_arrow_size', 'length'),
+        # ('edge_arrow_width', 'width'),
+        # ('edge_path', 'path'),
+        ('edge_loop_size', 'loopsize'),
+        ('edge_loop_position', 'loopposition'),
+        ('edge_loop_shape', 'loopshape'),
+    )
+
+    TIKZ_ARGS = (
+        ('edge_directed', 'Direct'),
+        ('edge_math_mode', 'Math'),
+        ('edge_rgb', 'RGB'),
+        ('edge_not_in_bg', 'NotInBG'),
+    )
+
     def __init__(self, id, u, v, **attr):
         """Initialize the edge drawer.
 
@@ -503,84 +817,41 @@ class TikzEdgeDrawer(object):
         self.v = v
         self.attributes = attr
         self.digits = DIGITS
-        # all options from the tikz-network library
-        self.tikz_kwds = OrderedDict()
-        self.tikz_kwds["edge_width"] = 'lw'
-        self.tikz_kwds["edge_color"] = 'color'
-        self.tikz_kwds["edge_r"] = 'R'
-        self.tikz_kwds["edge_g"] = 'G'
-        self.tikz_kwds["edge_b"] = 'B'
-        self.tikz_kwds["edge_opacity"] = 'opacity'
-        self.tikz_kwds["edge_curved"] = 'bend'
-        self.tikz_kwds["edge_label"] = 'label'
-        self.tikz_kwds["edge_label_position"] = 'position'
-        self.tikz_kwds["edge_label_distance"] = 'distance'
-        self.tikz_kwds["edge_label_color"] = 'fontcolor'
-        self.tikz_kwds["edge_label_size"] = 'fontscale'
-        self.tikz_kwds["edge_style"] = 'style'
-        # self.tikz_kwds["edge_arrow_size"] = 'length'
-        # self.tikz_kwds["edge_arrow_width"] = 'width'
-        # self.tikz_kwds["edge_path"] = 'path'
-        self.tikz_kwds["edge_loop_size"] = 'loopsize'
-        self.tikz_kwds["edge_loop_position"] = 'loopposition'
-        self.tikz_kwds["edge_loop_shape"] = 'loopshape'
-
-        self.tikz_args = OrderedDict()
-        self.tikz_args['edge_directed'] = 'Direct'
-        self.tikz_args['edge_math_mode'] = 'Math'
-        self.tikz_args['edge_rgb'] = 'RGB'
-        self.tikz_args['edge_not_in_bg'] = 'NotInBG'
 
     def _check_color(self, mode='tex'):
         """Check if RGB colors are used and return this option."""
         _color = self.attributes.get('edge_color', None)
         _label_color = self.attributes.get('edge_label_color', None)
+        _color_rgb = isinstance(_color, tuple)
+        _label_rgb = isinstance(_label_color, tuple)
 
         # logic to ensure compatible colour directives
-        if _color is None and _label_color is None:
-            # print("NOTE: using TIKZ default (edge) and (edge label) colours.")
-            pass
-        elif _color is None and isinstance(_label_color,tuple):
-            # print("NOTE: using TIKZ default (edge) and RGB (edge label) colours.")
-            self.attributes['edge_label_color'] = '{{{},{},{}}}'.format(
-            _label_color[0], _label_color[1], _label_color[2])  
+        if _color_rgb:
+            # RGB edge colour and RGB label colour (black if not given as RGB)
+            if not _label_rgb:
+                _label_color = (0, 0, 0)
+            self.attributes['edge_color'] = _rgb(_color)
+            self.attributes['edge_label_color'] = _rgb(_label_color)
             self.attributes['edge_rgb'] = True
-        elif not isinstance(_color,tuple) and isinstance(_label_color,tuple):
-            # print("NOTE: setting edge label colour to black.")
-            self.attributes['edge_label_color'] = 'black'
-            # the following line would set the labels to match the edge colour, but that might not be desirable
-            # self.attributes['edge_label_color'] = None
-        elif isinstance(_color,tuple) and not isinstance(_label_color,tuple):
-            # print("NOTE: setting edge label colour to RGB tuple (0,0,0).")
-            _label_color = (0,0,0)
-        elif isinstance(_color,tuple) and isinstance(_label_color,tuple):
-            # print("NOTE: using RGB for (edge) and (edge label) colours.")
-            pass
-
-        if isinstance(_color, tuple):
-            # edges
-            self.attributes['edge_color'] = '{{{},{},{}}}'.format(
-                _color[0], _color[1], _color[2])
-            # labels
-            self.attributes['edge_label_color'] = '{{{},{},{}}}'.format(
-            _label_color[0], _label_color[1], _label_color[2])  
-
+        elif _label_rgb and _color is None:
+            # TIKZ default edge colour and RGB label colour
+            self.attributes['edge_label_color'] = _rgb(_label_color)
             self.attributes['edge_rgb'] = True
+        elif _label_rgb:
+            # the label colour is set to black if the edge colour is not RGB
+            self.attributes['edge_label_color'] = 'black'
 
-
+        # csv export
         if mode == 'csv' and self.attributes.get('edge_rgb', False):
-            if isinstance(_color, tuple):
+            if _color_rgb:
                 self.attributes['edge_color'] = None
                 self.attributes['edge_r'] = _color[0]
                 self.attributes['edge_g'] = _color[1]
                 self.attributes['edge_b'] = _color[2]
-            elif not isinstance(_color, tuple):
+            else:
                 self.attributes['edge_r'] = self.attributes.get('edge_r', 0)
                 self.attributes['edge_g'] = self.attributes.get('edge_g', 0)
                 self.attributes['edge_b'] = self.attributes.get('edge_b', 0)
-            elif isinstance(_color, tuple) and self.attributes.get('edge_rgb', False) == False:
-                self.attributes['edge_color'] = None
-
 
     def _format_style(self):
         """Format the style attribute for the edge.
@@ -607,6 +878,30 @@ class TikzEdgeDrawer(object):
             self.attributes['edge_style'] = '{{-{{Latex[{}{}]}}, {} }}'.format(
                 arrow_size, arrow_width, self.attributes.get('edge_style', ''))
 
+    def _tex_options(self):
+        """Yield the tikz-network options of the set attributes."""
+        for k, tikz in self.TIKZ_KWDS:
+            if self.attributes.get(k, None) is not None:
+                yield ',{}={}'.format(tikz, self.attributes[k])
+        for k, tikz in self.TIKZ_ARGS:
+            if self.attributes.get(k, None) == True:
+                yield ',{}'.format(tikz)
+
+    def _csv_values(self):
+        """Yield the csv values of the set attributes."""
+        for k, _ in self.TIKZ_KWDS:
+            if k in self.attributes:
+                if self.attributes[k] is not None:
+                    yield ',{}'.format(self.attributes[k])
+                else:
+                    yield ', '
+        for k, _ in self.TIKZ_ARGS:
+            if k in self.attributes:
+                if self.attributes[k] == True:
+                    yield ',true'
+                else:
+                    yield ',false'
+
     def draw(self, mode='tex'):
         """Function to draw an virtual edge.
 
@@ -627,39 +922,17 @@ class TikzEdgeDrawer(object):
         if mode == 'tex':
             self._format_style()
             self._check_color()
-
-            string = '\\Edge['
-
-            for k in self.tikz_kwds:
-                if k in self.attributes and \
-                   self.attributes.get(k, None) is not None:
-                    string += ',{}={}'.format(self.tikz_kwds[k],
-                                              self.attributes[k])
-            for k in self.tikz_args:
-                if k in self.attributes:
-                    if self.attributes[k] == True:
-                        string += ',{}'.format(self.tikz_args[k])
-
-            string += ']({})({})'.format(self.u, self.v)
+            parts = ['\\Edge[']
+            parts.extend(self._tex_options())
+            parts.append(']({})({})'.format(self.u, self.v))
 
         elif mode == 'csv':
             self._check_color(mode='csv')
-            string = '{},{}'.format(self.u, self.v)
-
-            for k in self.tikz_kwds:
-                if k in self.attributes:
-                    if self.attributes[k] is not None:
-                        string += ',{}'.format(self.attributes[k])
-                    else:
-                        string += ', '
-            for k in self.tikz_args:
-                if k in self.attributes:
-                    if self.attributes[k] == True:
-                        string += ',true'
-                    else:
-                        string += ',false'
-
-        return string + '\n'
+            parts = ['{},{}'.format(self.u, self.v)]
+            parts.extend(self._csv_values())
+
+        parts.append('\n')
+        return ''.join(parts)
 
     def head(self):
         """Function to draw the header of an virtual edge.
@@ -672,15 +945,13 @@ class TikzEdgeDrawer(object):
 
         """
         self._check_color(mode='csv')
-        string = 'u,v'
-        for k in self.tikz_kwds:
-            if k in self.attributes:
-                string += ',{}'.format(self.tikz_kwds[k])
-        for k in self.tikz_args:
-            if k in self.attributes:
-                string += ',{}'.format(self.tikz_args[k])
-
-        return string + '\n'
+        parts = ['u,v']
+        parts.extend(',' + tikz for k, tikz in self.TIKZ_KWDS
+                     if k in self.attributes)
+        parts.extend(',' + tikz for k, tikz in self.TIKZ_ARGS
+                     if k in self.attributes)
+        parts.append('\n')
+        return ''.join(parts)
 
 
 class TikzNodeDrawer(object):
@@ -702,6 +973,38 @@ class TikzNodeDrawer(object):
 
     """
 
+    # format strings of the node position (with DIGITS decimal places); the
+    # positions are formatted per node, since numpy's string formatting
+    # (np.char.mod) is about three times slower than str.format
+    TEX_POSITION = '\\Vertex[x={{:.{0}f}},y={{:.{0}f}}'.format(DIGITS)
+    CSV_POSITION = '{{}},{{:.{0}f}},{{:.{0}f}}'.format(DIGITS)
+
+    # all options from the tikz-network library
+    TIKZ_KWDS = (
+        ('node_size', 'size'),
+        ('node_color', 'color'),
+        ('node_r', 'R'),
+        ('node_g', 'G'),
+        ('node_b', 'B'),
+        ('node_opacity', 'opacity'),
+        ('node_label', 'label'),
+        ('node_label_position', 'position'),
+        ('node_label_distance', 'distance'),
+        ('node_label_color', 'fontcolor'),
+        ('node_label_size', 'fontscale'),
+        ('node_shape', 'shape'),
+        ('node_style', 'style'),
+        ('node_layer', 'layer'),
+    )
+
+    TIKZ_ARGS = (
+        ('node_label_off', 'NoLabel'),
+        ('node_label_as_id', 'IdAsLabel'),
+        ('node_math_mode', 'Math'),
+        ('node_rgb', 'RGB'),
+        ('node_pseudo', 'Pseudo'),
+    )
+
     def __init__(self, id, **attr):
         """Initialize the node drawer.
 
@@ -721,78 +1024,65 @@ class TikzNodeDrawer(object):
         self.y = attr.get('layout', (0, 0))[1]
         self.attributes = attr
         self.digits = DIGITS
-        # all options from the tikz-network library
-        self.tikz_kwds = OrderedDict()
-        self.tikz_kwds['node_size'] = 'size'
-        self.tikz_kwds['node_color'] = 'color'
-        self.tikz_kwds["node_r"] = 'R'
-        self.tikz_kwds["node_g"] = 'G'
-        self.tikz_kwds["node_b"] = 'B'
-        self.tikz_kwds['node_opacity'] = 'opacity'
-        self.tikz_kwds['node_label'] = 'label'
-        self.tikz_kwds['node_label_position'] = 'position'
-        self.tikz_kwds['node_label_distance'] = 'distance'
-        self.tikz_kwds['node_label_color'] = 'fontcolor'
-        self.tikz_kwds['node_label_size'] = 'fontscale'
-        self.tikz_kwds['node_shape'] = 'shape'
-        self.tikz_kwds['node_style'] = 'style'
-        self.tikz_kwds['node_layer'] = 'layer'
-
-        self.tikz_args = OrderedDict()
-        self.tikz_args['node_label_off'] = 'NoLabel'
-        self.tikz_args['node_label_as_id'] = 'IdAsLabel'
-        self.tikz_args['node_math_mode'] = 'Math'
-        self.tikz_args['node_rgb'] = 'RGB'
-        self.tikz_args['node_pseudo'] = 'Pseudo'
 
     def _check_color(self, mode='tex'):
         """Check if RGB colors are used and return this option."""
         _color = self.attributes.get('node_color', None)
         _label_color = self.attributes.get('node_label_color', None)
+        _color_rgb = isinstance(_color, tuple)
+        _label_rgb = isinstance(_label_color, tuple)
 
         # logic to ensure compatible colour directives
-        if _color is None and _label_color is None:
-            pass
-        elif _color is None and isinstance(_label_color,tuple):
-            # print("NOTE: using TIKZ default (node) and RGB (node label) colours.")
-            self.attributes['node_label_color'] = '{{{},{},{}}}'.format(
-            _label_color[0], _label_color[1], _label_color[2])  
+        if _color_rgb:
+            # RGB node colour and RGB label colour (black if not given as RGB)
+            if not _label_rgb:
+                _label_color = (0, 0, 0)
+            self.attributes['node_color'] = _rgb(_color)
+            self.attributes['node_label_color'] = _rgb(_label_color)
             self.attributes['node_rgb'] = True
-        elif not isinstance(_color,tuple) and isinstance(_label_color,tuple):
-            # print("NOTE: setting node label colour to black.")
-            self.attributes['node_label_color'] = 'black'
-        elif isinstance(_color,tuple) and not isinstance(_label_color,tuple):
-            # print("NOTE: setting node label colour to tuple (0,0,0).")
-            _label_color = (0,0,0)
-        elif isinstance(_color,tuple) and isinstance(_label_color,tuple):
-            pass
-
-
-        if isinstance(_color, tuple):
-            # nodes
-            self.attributes['node_color'] = '{{{},{},{}}}'.format(
-                _color[0], _color[1], _color[2])
-            # node labels
-            self.attributes['node_label_color'] = '{{{},{},{}}}'.format(
-            _label_color[0], _label_color[1], _label_color[2])    
+        elif _label_rgb and _color is None:
+            # TIKZ default node colour and RGB label colour
+            self.attributes['node_label_color'] = _rgb(_label_color)
             self.attributes['node_rgb'] = True
+        elif _label_rgb:
+            # the label colour is set to black if the node colour is not RGB
+            self.attributes['node_label_color'] = 'black'
 
         # csv export
-        if mode == 'csv':
-            if isinstance(_color, tuple) and \
-                    self.attributes.get('node_rgb', False):
+        if mode == 'csv' and self.attributes.get('node_rgb', False):
+            if _color_rgb:
                 self.attributes['node_color'] = None
                 self.attributes['node_r'] = _color[0]
                 self.attributes['node_g'] = _color[1]
                 self.attributes['node_b'] = _color[2]
-            elif not isinstance(_color, tuple) and \
-                    self.attributes.get('node_rgb', False):
+            else:
                 self.attributes['node_r'] = self.attributes.get('node_r', 0)
                 self.attributes['node_g'] = self.attributes.get('node_g', 0)
                 self.attributes['node_b'] = self.attributes.get('node_b', 0)
-            elif isinstance(_color, tuple) and \
-                    self.attributes.get('node_rgb', False) == False:
-                self.attributes['node_color'] = None
+
+    def _tex_options(self):
+        """Yield the tikz-network options of the set attributes."""
+        for k, tikz in self.TIKZ_KWDS:
+            if self.attributes.get(k, None) is not None:
+                yield ',{}={}'.format(tikz, self.attributes[k])
+        for k, tikz in self.TIKZ_ARGS:
+            if self.attributes.get(k, None) == True:
+                yield ',{}'.format(tikz)
+
+    def _csv_values(self):
+        """Yield the csv values of the set attributes."""
+        for k, _ in self.TIKZ_KWDS:
+            if k in self.attributes:
+                if self.attributes[k] is not None:
+                    yield ',{}'.format(self.attributes[k])
+                else:
+                    yield ', '
+        for k, _ in self.TIKZ_ARGS:
+            if k in self.attributes:
+                if self.attributes[k] == True:
+                    yield ',true'
+                else:
+                    yield ',false'
 
     def draw(self, mode='tex'):
         """Function to draw a virtual node.
@@ -813,41 +1103,17 @@ class TikzNodeDrawer(object):
         """
         if mode == 'tex':
             self._check_color()
-            string = '\\Vertex[x={x:.{n}f},y={y:.{n}f}'\
-                     ''.format(x=self.x, y=self.y, n=self.digits)
-
-            for k in self.tikz_kwds:
-                if k in self.attributes and \
-                   self.attributes.get(k, None) is not None:
-                    string += ',{}={}'.format(self.tikz_kwds[k],
-                                              self.attributes[k])
-            for k in self.tikz_args:
-                if k in self.attributes:
-                    if self.attributes[k] == True:
-                        string += ',{}'.format(self.tikz_args[k])
-
-            string += ']{{{}}}'.format(self.id)
+            parts = [self.TEX_POSITION.format(self.x, self.y)]
+            parts.extend(self._tex_options())
+            parts.append(']{{{}}}'.format(self.id))
 
         elif mode == 'csv':
             self._check_color(mode='csv')
-            string = '{id},{x:.{n}f},{y:.{n}f}'\
-                     ''.format(id=self.id, x=self.x, y=self.y, n=self.digits)
-
-            for k in self.tikz_kwds:
-                if k in self.attributes:
-                    if self.attributes[k] is not None:
-                        string += ',{}'.format(self.attributes[k])
-                    else:
-                        string += ', '
-
-            for k in self.tikz_args:
-                if k in self.attributes:
-                    if self.attributes[k] == True:
-                        string += ',true'
-                    else:
-                        string += ',false'
+            parts = [self.CSV_POSITION.format(self.id, self.x, self.y)]
+            parts.extend(self._csv_values())
 
-        return string + '\n'
+        parts.append('\n')
+        return ''.join(parts)
 
     def head(self):
         """Function to draw the header of a virtual node.
@@ -860,15 +1126,13 @@ class TikzNodeDrawer(object):
 
         """
         self._check_color(mode='csv')
-        string = 'id,x,y'
-        for k in self.tikz_kwds:
-            if k in self.attributes:
-                string += ',{}'.format(self.tikz_kwds[k])
-        for k in self.tikz_args:
-            if k in self.attributes:
-                string += ',{}'.format(self.tikz_args[k])
-
-        return string + '\n'
+        parts = ['id,x,y']
+        parts.extend(',' + tikz for k, tikz in self.TIKZ_KWDS
+                     if k in self.attributes)
+        parts.extend(',' + tikz for k, tikz in self.TIKZ_ARGS
+                     if k in self.attributes)
+        parts.append('\n')
+        return ''.join(parts)
 
 # =============================================================================
 # eof
@@ -21,11 +21,83 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 # =============================================================================
+import hashlib
 import numpy as np
+from collections import OrderedDict
+from functools import lru_cache
 from . import logger
 from .exceptions import CnetError, CnetNotImplemented
 log = logger(__name__)
 
+# minimal number of nodes for which the numba compiled layout is used
+NUMBA_MIN_NODES = 100
+
+# minimal number of nodes for which the layout is computed on the GPU
+GPU_MIN_NODES = 2000
+
+# opening angle of the Barnes-Hut approximation used by the sparse solver
+BARNES_HUT_THETA = 0.9
+
+# numba signature of _fr_iterate (layout, row, col, data, fixed, k, t, dt,
+# iterations, threshold)
+FR_SIGNATURE = ('f8[:, ::1](f8[:, ::1], i4[::1], i4[::1], f4[::1], b1[::1], '
+                'f8, f8, f8, i8, f8)')
+
+# number of generated layouts kept for later drawings of the same network
+LAYOUT_CACHE_SIZE = 32
+_LAYOUT_CACHE = OrderedDict()
+
+
+def _freeze(value):
+    """Returns a hashable version of a (nested) attribute value."""
+    if isinstance(value, dict):
+        return tuple((key, _freeze(val)) for key, val in value.items())
+    elif isinstance(value, (list, tuple, np.ndarray)):
+        return tuple(_freeze(val) for val in value)
+    # the type is part of the key, since e.g. 1 == 1.0 == True
+    return type(value), value
+
+
+def _matrix_digest(matrix):
+    """Returns the shape and a digest of a sparse matrix (or None)."""
+    if matrix is None:
+        return None
+    matrix = matrix.tocoo()
+    digest = hashlib.sha1()
+    for array in (matrix.row, matrix.col, matrix.data):
+        digest.update(np.ascontiguousarray(array).tobytes())
+    return matrix.shape, digest.hexdigest()
+
+
+def _network_type(network):
+    """Returns the type of the network, i.e. the top level module of its class.
+
+    E.g. 'networkx' for a networkx.DiGraph, which is used by the layout and
+    the drawing to read the network.
+
+    """
+    return type(network).__module__.split('.', 1)[0]
+
+
+def _layout_key(layout):
+    """Returns the cache key of a layout or None if it cannot be cached.
+
+    The key combines the nodes, a digest of the adjacency matrix and the
+    options of the layout, so that a network which is changed between two
+    drawings gets a new layout.
+
+    """
+    matrix = _matrix_digest(layout.adjacency_matrix)
+    key = (tuple(layout.nodes), matrix, layout.layout_type, layout.k,
+           _freeze(layout.fixed), layout.iterations, layout.threshold,
+           layout.dimension, layout.seed, _freeze(layout.positions),
+           layout.device)
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
 
 def layout(network, **kwds):
     """Function to generate a layout for the network.
@@ -133,6 +205,16 @@ def layout(network, **kwds):
       the seed used by the random number generator, if None, the a random seed
       by created by the numpy random number generator is used.
 
+    - ``device`` : string, optional (default = 'cpu')
+      Device used to compute the Fruchterman-Reingold layout. If 'gpu' and
+      the cupy package is installed, layouts of more than 2000 nodes are
+      computed on the GPU.
+
+    - ``cache`` : bool, optional (default = True)
+      Whether layouts generated with a ``seed`` are cached and reused when
+      the layout of the same network is generated again with the same
+      options. If ``False``, the layout is always recomputed.
+
     In the layout style dictionary multiple keywords can be used to address
     attributes. These keywords will be converted to an unique key word,
     used in the remaining code.
@@ -211,23 +293,24 @@ def layout(network, **kwds):
         _weight = kwds.get('layout_weight', None)
 
     # check type of network
-    if 'cnet' in str(type(network)):
+    _type = _network_type(network)
+    if _type == 'cnet':
         # log.debug('The network is of type "cnet".')
         nodes = list(network.nodes)
         adjacency_matrix = network.adjacency_matrix(weight=_weight)
 
-    elif 'networkx' in str(type(network)):
+    elif _type == 'networkx':
         # log.debug('The network is of type "networkx".')
         nodes = list(network.nodes())
         import networkx as nx
         adjacency_matrix = nx.adjacency_matrix(network, weight=_weight)
-    elif 'igraph' in str(type(network)):
+    elif _type == 'igraph':
         # log.debug('The network is of type "igraph".')
         nodes = list(range(len(network.vs)))
         from scipy.sparse import coo_matrix
         A = np.array(network.get_adjacency(attribute=_weight).data)
         adjacency_matrix = coo_matrix(A)
-    elif 'pathpy' in str(type(network)):
+    elif _type == 'pathpy':
         # log.debug('The network is of type "pathpy".')
         nodes = list(network.nodes)
         if _weight is not None:
@@ -255,6 +338,303 @@ def layout(network, **kwds):
     return layout.generate_layout()
 
 
+def _make_fr_iterate(prange):
+    """Returns the Fruchterman-Reingold iterations using the given range.
+
+    The parallel range is bound to the returned function, i.e. prange is
+    numba.prange for the compiled function and range for the pure python
+    one.
+
+    """
+    def _fr_iterate(layout, row, col, data, fixed, k, t, dt, iterations,
+                    threshold):
+        """Fruchterman-Reingold iterations on explicit loops.
+
+        The adjacency matrix is given by its COO arrays (row, col, data) and
+        fixed is a boolean mask of the nodes which are not moved. The layout is
+        updated in place. This function is compiled with numba if available,
+        where the repulsive forces of the nodes are computed in parallel (i.e.
+        the loops over prange).
+
+        """
+        _n, dim = layout.shape
+        displacement = np.zeros((_n, dim))
+        delta = np.zeros(dim)
+        for iteration in range(iterations):
+            displacement[:] = 0.0
+            # repulsive forces between all pairs of nodes, where every row
+            # sums over all j (and not only over j > i with the force also
+            # added to j) so that the rows are computed in parallel without
+            # shared writes
+            if dim == 2:
+                # 2 dimensional layouts on scalars, where i == j adds nothing
+                # and the coordinates are contiguous so the inner loop is
+                # vectorized
+                x = np.ascontiguousarray(layout[:, 0])
+                y = np.ascontiguousarray(layout[:, 1])
+                for i in prange(_n):
+                    force_x = 0.0
+                    force_y = 0.0
+                    for j in range(_n):
+                        delta_x = x[i] - x[j]
+                        delta_y = y[i] - y[j]
+                        # enforce minimum distance of 0.01
+                        distance = max(
+                            delta_x * delta_x + delta_y * delta_y, 1e-4)
+                        force_x += delta_x * k * k / distance
+                        force_y += delta_y * k * k / distance
+                    displacement[i, 0] = force_x
+                    displacement[i, 1] = force_y
+            else:
+                for i in prange(_n):
+                    for j in range(_n):
+                        if i == j:
+                            continue
+                        distance = 0.0
+                        for d in range(dim):
+                            distance += (layout[i, d] - layout[j, d])**2
+                        # enforce minimum distance of 0.01 (on the squares)
+                        distance = max(distance, 1e-4)
+                        for d in range(dim):
+                            displacement[i, d] += (
+                                layout[i, d] - layout[j, d]) * k * k / distance
+            # attractive forces along the edges
+            for e in range(row.shape[0]):
+                i = row[e]
+                j = col[e]
+                distance = 0.0
+                for d in range(dim):
+                    delta[d] = layout[i, d] - layout[j, d]
+                    distance += delta[d] * delta[d]
+                distance = max(np.sqrt(distance), 0.01)
+                for d in range(dim):
+                    displacement[i, d] -= delta[d] * data[e] * distance / k
+            # update positions
+            error = 0.0
+            for i in range(_n):
+                if fixed[i]:
+                    continue
+                length = 0.0
+                for d in range(dim):
+                    length += displacement[i, d] * displacement[i, d]
+                length = np.sqrt(length)
+                if length < 0.01:
+                    length = 0.1
+                for d in range(dim):
+                    step = displacement[i, d] * t / length
+                    layout[i, d] += step
+                    error += step * step
+            # cool temperature
+            t -= dt
+            if np.sqrt(error) / _n < threshold:
+                break
+        return layout
+
+    return _fr_iterate
+
+
+# Fruchterman-Reingold iterations in pure python
+_fr_iterate = _make_fr_iterate(range)
+
+
+@lru_cache(maxsize=None)
+def _jit_fr_iterate():
+    """Return the numba compiled _fr_iterate or None if numba is missing.
+
+    The signature is given explicitly, i.e. the function is compiled (or
+    loaded from the cache) right here and not on its first call.
+
+    """
+    try:
+        import numba
+    except ImportError:
+        return None
+    return numba.njit(FR_SIGNATURE, cache=True, fastmath=True, parallel=True,
+                      boundscheck=False)(_make_fr_iterate(numba.prange))
+
+
+def _barnes_hut_repulsion(layout, k, theta):
+    """Repulsive forces between all nodes with the Barnes-Hut approximation.
+
+    The quadtree is stored level by level via the sorted Morton codes of the
+    node positions. A cell whose width over its distance to a node is below
+    theta acts on this node with its total mass at its center of mass, all
+    other cells are opened. Within the remaining leaf cells the forces are
+    computed exactly. This needs O(n log n) instead of O(n^2) operations.
+
+    Returns the forces and the corresponding repulsive energy, i.e. the sum
+    of -k^2 log(d) over all pairs of nodes.
+
+    """
+    _n = layout.shape[0]
+    lower = layout.min(axis=0)
+    size = max((layout.max(axis=0) - lower).max(), 1e-12) * (1 + 1e-9)
+    # about one node per leaf cell
+    depth = int(min(max(np.ceil(np.log2(_n) / 2) + 2, 1), 16))
+
+    # Morton codes of the nodes at the deepest level
+    cells = ((layout - lower) / size * 2**depth).astype(np.int64)
+    np.clip(cells, 0, 2**depth - 1, out=cells)
+    code = np.zeros(_n, dtype=np.int64)
+    for b in range(depth):
+        code |= ((cells[:, 0] >> b) & 1) << (2 * b + 1)
+        code |= ((cells[:, 1] >> b) & 1) << (2 * b)
+    order = np.argsort(code, kind='stable')
+    code = code[order]
+    points = layout[order]
+
+    # keys, first node, mass and center of mass of the cells of each level
+    keys, first, mass, center, member = [], [], [], [], []
+    for level in range(depth + 1):
+        _code = code >> 2 * (depth - level)
+        new = np.r_[True, _code[1:] != _code[:-1]]
+        _first = np.flatnonzero(new)
+        keys.append(_code[_first])
+        first.append(_first)
+        mass.append(np.diff(np.r_[_first, _n]))
+        center.append(np.add.reduceat(points, _first, axis=0) /
+                      mass[-1][:, np.newaxis])
+        # cell of each node
+        member.append(np.cumsum(new) - 1)
+
+    force = np.zeros_like(points)
+    energy = 0.0
+    node = np.arange(_n)
+    cell = np.zeros(_n, dtype=np.int64)
+    for level in range(depth + 1):
+        delta = points[node] - center[level][cell]
+        # squared distances, i.e. no square roots are needed
+        distance = np.einsum('ij,ij->i', delta, delta)
+        # s/d < theta and the node is not part of the cell
+        far = ((size / 2**level)**2 < theta**2 * distance) & \
+            (member[level][node] != cell)
+        distance = np.clip(distance[far], 1e-4, None)
+        weights = delta[far] * \
+            (mass[level][cell[far]] * k * k / distance)[:, np.newaxis]
+        energy -= k * k / 2 * np.dot(mass[level][cell[far]], np.log(distance))
+        for d in range(points.shape[1]):
+            force[:, d] += np.bincount(node[far], weights=weights[:, d],
+                                       minlength=_n)
+        node, cell = node[~far], cell[~far]
+
+        # open the remaining cells, i.e. take the child cells or the nodes
+        if level < depth:
+            parents = keys[level + 1] >> 2
+            start = np.searchsorted(parents, keys[level][cell], 'left')
+            count = np.searchsorted(parents, keys[level][cell], 'right') - start
+        else:
+            start = first[level][cell]
+            count = mass[level][cell]
+        offset = np.arange(count.sum()) - \
+            np.repeat(np.cumsum(count) - count, count)
+        node = np.repeat(node, count)
+        cell = np.repeat(start, count) + offset
+
+    # exact forces between the nodes of the opened leaf cells
+    other = cell[node != cell]
+    node = node[node != cell]
+    delta = points[node] - points[other]
+    distance = np.einsum('ij,ij->i', delta, delta)
+    np.maximum(distance, 1e-4, out=distance)
+    weights = delta * (k * k / distance)[:, np.newaxis]
+    energy -= k * k / 2 * np.log(distance).sum()
+    for d in range(points.shape[1]):
+        force[:, d] += np.bincount(node, weights=weights[:, d], minlength=_n)
+
+    # restore the order of the nodes
+    result = np.empty_like(force)
+    result[order] = force
+    # every pair was counted from both sides
+    return result, energy / 2
+
+
+def _fr_energy_and_grad(x, edges, k, dimension):
+    """Fruchterman-Reingold energy of a flat layout and its gradient.
+
+    The energy is the sum of w d^3/(6k) over the edges (row, col, weight) of
+    the adjacency matrix (i.e. d^3/(3k) per undirected edge) minus k^2 log(d)
+    over all pairs of nodes, where the repulsion is approximated by the
+    Barnes-Hut quadtree. The negative gradient equals the
+    Fruchterman-Reingold forces.
+
+    """
+    row, col, weight = edges
+    layout = x.reshape(-1, dimension)
+    force, energy = _barnes_hut_repulsion(layout, k, BARNES_HUT_THETA)
+    # attractive forces along the edges
+    delta = layout[row] - layout[col]
+    distance = np.sqrt(np.einsum('ij,ij->i', delta, delta))
+    # enforce minimum distance of 0.01
+    np.maximum(distance, 0.01, out=distance)
+    energy += np.dot(weight, distance**3) / (6 * k)
+    # every entry pulls both of its nodes, i.e. the gradient also matches
+    # the energy for asymmetric (directed) adjacency matrices
+    weights = delta * (weight * distance / (2 * k))[:, np.newaxis]
+    for d in range(dimension):
+        force[:, d] -= np.bincount(row, weights=weights[:, d],
+                                   minlength=layout.shape[0])
+        force[:, d] += np.bincount(col, weights=weights[:, d],
+                                   minlength=layout.shape[0])
+    return energy, -force.ravel()
+
+
+def _fr_array_iterate(xp, layout, row, col, weight, fixed, k, t, dt,
+                      iterations, threshold):
+    """Fruchterman-Reingold iterations for an array module like numpy.
+
+    Used with cupy to compute the layout on the GPU, where xp is the array
+    module and all arrays are already on its device. The repulsion is
+    computed on (n, n) matrices without the (n, n, d) differences, i.e.
+    the sum over c_ij * (x_i - x_j) is x_i * sum_j(c_ij) - C x.
+
+    """
+    _n, dim = layout.shape
+    for iteration in range(iterations):
+        # squared distances between all pairs of points
+        distance = xp.zeros((_n, _n), dtype=layout.dtype)
+        for d in range(dim):
+            distance += (layout[:, d, None] - layout[None, :, d])**2
+        # enforce minimum distance of 0.01
+        xp.maximum(distance, 1e-4, out=distance)
+        # repulsive forces between all points
+        coefficient = k * k / distance
+        xp.fill_diagonal(coefficient, 0.0)
+        displacement = layout * coefficient.sum(axis=1)[:, None] - \
+            coefficient.dot(layout)
+        # attractive forces along the edges
+        delta = layout[row] - layout[col]
+        distance = xp.sqrt(xp.einsum('ij,ij->i', delta, delta))
+        xp.maximum(distance, 0.01, out=distance)
+        attraction = delta * (weight * distance / k)[:, None]
+        for d in range(dim):
+            displacement[:, d] -= xp.bincount(row, weights=attraction[:, d],
+                                              minlength=_n)
+        # update positions
+        length = xp.sqrt(xp.einsum('ij,ij->i', displacement, displacement))
+        length[length < 0.01] = 0.1
+        delta_layout = displacement * (t / length)[:, None]
+        delta_layout[fixed] = 0.0
+        layout += delta_layout
+        # cool temperature
+        t -= dt
+        error = xp.sqrt(xp.einsum('ij,ij->', delta_layout, delta_layout))
+        if float(error) / _n < threshold:
+            break
+    return layout
+
+
+@lru_cache(maxsize=None)
+def _cupy():
+    """Return the cupy module or None if cupy is missing."""
+    try:
+        import cupy
+    except ImportError:
+        log.warning('The layout on the GPU needs the cupy package: '
+                    'https://cupy.dev/')
+        return None
+    return cupy
+
+
 class Layout(object):
     """Default class to create layouts
 
@@ -299,6 +679,7 @@ class Layout(object):
 
         # initialize variables
         self.nodes = nodes
+        self.node_index = {n: i for i, n in enumerate(nodes)}
         self.adjacency_matrix = adjacency_matrix
 
         # rename the attributes
@@ -313,7 +694,11 @@ class Layout(object):
         self.weight = attr.get('weight', None)
         self.dimension = attr.get('dimension', 2)
         self.seed = attr.get('seed', None)
+        # random number generator of the layouts
+        self.rng = np.random.default_rng(self.seed)
         self.positions = attr.get('positions', None)
+        self.device = attr.get('device', 'cpu')
+        self.cache = attr.get('cache', True)
 
         # TODO: allow also higher dimensional layouts
         if self.dimension != 2:
@@ -364,19 +749,56 @@ class Layout(object):
         return {**_kwds, **kwds}
 
     def generate_layout(self):
-        """Function to pick and generate the right layout."""
+        """Function to pick and generate the right layout.
+
+        Returns
+        -------
+        layout : dict
+            A dictionary of positions keyed by node
+
+        """
+        self.generate_layout_array()
+        return self.layout_dict
+
+    def generate_layout_array(self):
+        """Generate the layout as an array of node positions.
+
+        Returns
+        -------
+        layout : numpy.ndarray
+            An array of shape (n, dimension), where the i-th row is the
+            position of the i-th node in :py:attr:`nodes`
+
+        """
+        # seeded layouts of the same network and options are reused
+        key = None
+        if self.cache and self.seed is not None:
+            key = _layout_key(self)
+        if key is not None and key in _LAYOUT_CACHE:
+            _LAYOUT_CACHE.move_to_end(key)
+            self.layout_array = _LAYOUT_CACHE[key].copy()
+            return self.layout_array
+
         # method names
         names_rand = ['Random', 'random', 'rand', None]
         names_fr = ['Fruchterman-Reingold', 'fruchterman_reingold', 'fr',
                     'spring_layout', 'spring layout', 'FR']
         # check which layout should be plotted
         if self.layout_type in names_rand:
-            self.layout = self.random()
+            self.layout_array = self.random()
         elif self.layout_type in names_fr:
-            self.layout = self.fruchterman_reingold()
+            self.layout_array = self.fruchterman_reingold()
+
+        if key is not None:
+            _LAYOUT_CACHE[key] = np.array(self.layout_array)
+            if len(_LAYOUT_CACHE) > LAYOUT_CACHE_SIZE:
+                _LAYOUT_CACHE.popitem(last=False)
+        return self.layout_array
 
-        # print(self.layout)
-        return self.layout
+    @property
+    def layout_dict(self):
+        """Dictionary of the node positions keyed by node."""
+        return dict(zip(self.nodes, self.layout_array))
 
     def random(self):
         """Position nodes uniformly at random in the unit square.
@@ -401,13 +823,11 @@ class Layout(object):
 
         Returns
         -------
-        layout : dict
-            A dictionary of positions keyed by node
+        layout : numpy.ndarray
+            An array of positions, where the i-th row belongs to the i-th node
 
         """
-        np.random.seed(self.seed)
-        layout = np.random.rand(len(self.nodes), self.dimension)
-        return dict(zip(self.nodes, layout))
+        return self.rng.random((len(self.nodes), self.dimension))
 
     def fruchterman_reingold(self):
         """Position nodes using Fruchterman-Reingold force-directed algorithm.
@@ -421,6 +841,10 @@ class Layout(object):
         This algorithm can be enabled with the keywords: 'Fruchterman-Reingold',
         'fruchterman_reingold', 'fr', 'spring_layout', 'spring layout', 'FR'
 
+        For networks without edges, with less than two nodes or with zero
+        iterations, the initial positions are returned, i.e. the given
+        positions or a random layout.
+
         **Keyword arguments used for the layout:**
 
         - ``force`` : float, optional (default = None)
@@ -455,48 +879,72 @@ class Layout(object):
           the seed used by the random number generator, if None, the a random seed
           by created by the numpy random number generator is used.
 
+        - ``device`` : string, optional (default = 'cpu')
+          Device used to compute the Fruchterman-Reingold layout. If 'gpu' and
+          the cupy package is installed, layouts of more than 2000 nodes are
+          computed on the GPU.
+
         Returns
         -------
-        layout : dict
-            A dictionary of positions keyed by node
+        layout : numpy.ndarray
+            An array of positions, where the i-th row belongs to the i-th node
 
         """
 
         # convert adjacency matrix
         self.adjacency_matrix = self.adjacency_matrix.astype(float)
 
+        # the edges as parallel arrays (row, col, weight), sorted by rows
+        _edges = self.adjacency_matrix.tocsr().tocoo()
+        self.edges = (_edges.row.astype(np.int32),
+                      _edges.col.astype(np.int32),
+                      _edges.data.astype(np.float32))
+
         if self.fixed is not None:
-            self.fixed = np.asarray([self.nodes.index(v) for v in self.fixed])
+            self.fixed = np.fromiter((self.node_index[v] for v in self.fixed),
+                                     dtype=np.int32, count=len(self.fixed))
 
+        _size = 1
         if self.positions is not None:
             # Determine size of existing domain to adjust initial positions
-            _size = max(coord for t in layout.values() for coord in t)
+            _size = max(coord for t in self.positions.values() for coord in t)
             if _size == 0:
                 _size = 1
-            np.random.seed(self.seed)
-            self.layout = np.random.rand(
-                len(self.nodes), self.dimension) * _size
+            self.layout = self.rng.random(
+                (len(self.nodes), self.dimension)) * _size
 
-            for i, n in enumerate(self.nodes):
-                if n in self.positions:
-                    self.layout[i] = np.asarray(self.positions[n])
+            _nodes = [n for n in self.positions if n in self.node_index]
+            if _nodes:
+                self.layout[[self.node_index[n] for n in _nodes]] = \
+                    np.array([self.positions[n] for n in _nodes])
         else:
             self.layout = None
 
+        # nothing to optimize without edges, nodes to move or iterations
+        if self.adjacency_matrix.nnz == 0 or len(self.nodes) < 2 or \
+           self.iterations == 0:
+            if self.layout is not None:
+                return self.layout
+            return self.random()
+
         if self.k is None and self.fixed is not None:
             # We must adjust k by domain size for layouts not near 1x1
             self.k = _size / np.sqrt(len(self.nodes))
 
-        try:
-            # Sparse matrix
-            if len(self.nodes) < 500:  # sparse solver for large graphs
-                raise ValueError
+        # use the compiled solver for large graphs if numba is installed
+        if self.device == 'gpu' and len(self.nodes) > GPU_MIN_NODES and \
+           _cupy() is not None:
+            layout = self._gpu_fruchterman_reingold()
+        elif len(self.nodes) > NUMBA_MIN_NODES and \
+           _jit_fr_iterate() is not None:
+            layout = self._numba_fruchterman_reingold()
+        # sparse solver for large graphs with few edges
+        elif len(self.nodes) >= 500 and \
+                self.adjacency_matrix.nnz < 0.1 * len(self.nodes)**2:
             layout = self._sparse_fruchterman_reingold()
-        except:
+        else:
             layout = self._fruchterman_reingold()
 
-        layout = dict(zip(self.nodes, layout))
-
         return layout
 
     def _fruchterman_reingold(self):
@@ -508,8 +956,11 @@ class Layout(object):
         Penney <rwpenney@users.sourceforge.net> All rights reserved. BSD
         license.)
 
+        For more than 500 nodes the positions are computed in single
+        precision.
+
         """
-        A = self.adjacency_matrix.todense()
+        A = self.adjacency_matrix
         k = self.k
         try:
             _n, _ = A.shape
@@ -518,17 +969,21 @@ class Layout(object):
                       'matrix as input')
             raise CnetError
 
-        # make sure we have an array instead of a matrix
-        A = np.asarray(A)
+        try:
+            from scipy.spatial.distance import pdist, squareform
+        except ImportError:
+            log.error('The Fruchterman-Reingold algorithm needs the '
+                      'scipy package: http://scipy.org/')
+            raise ImportError
+        row, col, weight = self.edges
+        # single precision for large graphs halves the memory of the pairs
+        dtype = np.float32 if _n > 500 else np.float64
 
         if self.layout is None:
             # random initial positions
-            np.random.seed(self.seed)
-            layout = np.asarray(np.random.rand(
-                _n, self.dimension), dtype=A.dtype)
+            layout = self.rng.random((_n, self.dimension), dtype=dtype)
         else:
-            # make sure positions are of same type as matrix
-            layout = self.layout.astype(A.dtype)
+            layout = self.layout.astype(dtype)
 
         # optimal distance between nodes
         if k is None:
@@ -537,42 +992,121 @@ class Layout(object):
         # this is the largest step allowed in the dynamics.
         # We need to calculate this in case our fixed positions force our domain
         # to be much bigger than 1x1
-        t = max(max(layout.T[0]) - min(layout.T[0]),
-                max(layout.T[1]) - min(layout.T[1])) * 0.1
+        t = float(max(max(layout.T[0]) - min(layout.T[0]),
+                      max(layout.T[1]) - min(layout.T[1]))) * 0.1
         # simple cooling scheme.
         # linearly step down by dt on each iteration so last iteration is size dt.
         dt = t / float(self.iterations + 1)
-        delta = np.zeros(
-            (layout.shape[0], layout.shape[0], layout.shape[1]), dtype=A.dtype)
-        # the inscrutable (but fast) version
-        # this is still O(V^2)
-        # could use multilevel methods to speed this up significantly
+        delta_layout = np.empty_like(layout)
         for iteration in range(self.iterations):
-            # matrix of difference between points
-            delta = layout[:, np.newaxis, :] - layout[np.newaxis, :, :]
-            # distance between points
-            distance = np.linalg.norm(delta, axis=-1)
+            # squared distances between the unique pairs of points (i < j)
+            distance = pdist(layout, 'sqeuclidean')
             # enforce minimum distance of 0.01
-            np.clip(distance, 0.01, None, out=distance)
-            # displacement "force"
-            displacement = np.einsum('ijk,ij->ik',
-                                     delta,
-                                     (k * k / distance**2 - A * distance / k))
-            # update layoutitions
-            length = np.linalg.norm(displacement, axis=-1)
-            length = np.where(length < 0.01, 0.1, length)
-            delta_layout = np.einsum('ij,i->ij', displacement, t / length)
+            np.clip(distance, 1e-4, None, out=distance)
+            # repulsive "force" between all points, where the sum over
+            # c_ij * (x_i - x_j) is x_i * sum_j(c_ij) - C x
+            np.divide(k * k, distance, out=distance)
+            coefficient = squareform(distance.astype(dtype, copy=False))
+            displacement = layout * coefficient.sum(axis=1)[:, np.newaxis] - \
+                coefficient.dot(layout)
+            # attractive "force" along the edges
+            delta = layout[row] - layout[col]
+            distance = np.sqrt(np.einsum('ij,ij->i', delta, delta))
+            np.maximum(distance, 0.01, out=distance)
+            np.subtract.at(displacement, row, (delta * (
+                weight * distance / k)[:, np.newaxis]).astype(dtype))
+            # update layoutitions, i.e. every free node moves by t (unless its
+            # displacement is below 0.01), so all pair distances change
+            length = np.sqrt(np.einsum('ij,ij->i', displacement, displacement))
+            length[length < 0.01] = 0.1
+            np.multiply(displacement, (t / length)[:, np.newaxis],
+                        out=delta_layout)
             if self.fixed is not None:
                 # don't change positions of fixed nodes
                 delta_layout[self.fixed] = 0.0
-            layout += delta_layout
+            np.add(layout, delta_layout, out=layout)
             # cool temperature
             t -= dt
-            error = np.linalg.norm(delta_layout) / _n
+            error = np.sqrt(
+                np.einsum('ij,ij->', delta_layout, delta_layout)) / _n
             if error < self.threshold:
                 break
         return layout
 
+    def _numba_fruchterman_reingold(self):
+        """Fruchterman-Reingold algorithm compiled with numba.
+
+        The same algorithm as :py:meth:`_fruchterman_reingold`, where the
+        forces are computed in a loop compiled with numba (http://numba.org)
+        over the nodes and the non-zero entries of the adjacency matrix.
+
+        """
+        row, col, weight = self.edges
+        k = self.k
+        _n = len(self.nodes)
+
+        if self.layout is None:
+            # random initial positions
+            layout = self.rng.random((_n, self.dimension))
+        else:
+            layout = self.layout.astype(float)
+
+        fixed = np.zeros(_n, dtype=bool)
+        if self.fixed is not None:
+            fixed[self.fixed] = True
+
+        # optimal distance between nodes
+        if k is None:
+            k = np.sqrt(1.0 / _n)
+        # the initial "temperature"  is about .1 of domain area (=1x1)
+        t = max(max(layout.T[0]) - min(layout.T[0]),
+                max(layout.T[1]) - min(layout.T[1])) * 0.1
+        # simple cooling scheme.
+        dt = t / float(self.iterations + 1)
+
+        return _jit_fr_iterate()(
+            np.ascontiguousarray(layout, dtype=np.float64),
+            row, col, weight, fixed, float(k),
+            float(t), float(dt), int(self.iterations), float(self.threshold))
+
+    def _gpu_fruchterman_reingold(self):
+        """Fruchterman-Reingold algorithm on the GPU with cupy.
+
+        The same algorithm as :py:meth:`_fruchterman_reingold`, where the
+        arrays are copied to the GPU with cupy (https://cupy.dev/) and the
+        iterations are computed there.
+
+        """
+        cupy = _cupy()
+        row, col, weight = self.edges
+        k = self.k
+        _n = len(self.nodes)
+
+        if self.layout is None:
+            # random initial positions
+            layout = self.rng.random((_n, self.dimension))
+        else:
+            layout = self.layout.astype(float)
+
+        fixed = np.zeros(_n, dtype=bool)
+        if self.fixed is not None:
+            fixed[self.fixed] = True
+
+        # optimal distance between nodes
+        if k is None:
+            k = np.sqrt(1.0 / _n)
+        # the initial "temperature"  is about .1 of domain area (=1x1)
+        t = max(max(layout.T[0]) - min(layout.T[0]),
+                max(layout.T[1]) - min(layout.T[1])) * 0.1
+        # simple cooling scheme.
+        dt = t / float(self.iterations + 1)
+
+        layout = _fr_array_iterate(
+            cupy, cupy.asarray(layout), cupy.asarray(row), cupy.asarray(col),
+            cupy.asarray(weight), cupy.asarray(fixed), float(k), float(t),
+            float(dt), int(self.iterations), float(self.threshold))
+        return cupy.asnumpy(layout)
+
     def _sparse_fruchterman_reingold(self):
         """Fruchterman-Reingold algorithm for sparse matrices.
 
@@ -592,69 +1126,38 @@ class Layout(object):
                       'matrix as input')
             raise CnetError
         try:
-            from scipy.sparse import spdiags, coo_matrix
+            from scipy.optimize import minimize
         except ImportError:
             log.error('The sparse Fruchterman-Reingold algorithm needs the '
                       'scipy package: http://scipy.org/')
             raise ImportError
-        # make sure we have a LIst of Lists representation
-        try:
-            A = A.tolil()
-        except:
-            A = (coo_matrix(A)).tolil()
 
         if self.layout is None:
             # random initial positions
-            np.random.seed(self.seed)
-            layout = np.asarray(np.random.rand(
-                _n, self.dimension), dtype=A.dtype)
+            layout = self.rng.random((_n, self.dimension))
         else:
-            # make sure positions are of same type as matrix
-            layout = layout.astype(A.dtype)
-
-        # no fixed nodes
-        if self.fixed is None:
-            self.fixed = []
+            layout = self.layout.astype(float)
 
         # optimal distance between nodes
         if k is None:
             k = np.sqrt(1.0 / _n)
-        # the initial "temperature"  is about .1 of domain area (=1x1)
-        # this is the largest step allowed in the dynamics.
-        t = max(max(layout.T[0]) - min(layout.T[0]),
-                max(layout.T[1]) - min(layout.T[1])) * 0.1
-        # simple cooling scheme.
-        # linearly step down by dt on each iteration so last iteration is size dt.
-        dt = t / float(self.iterations + 1)
 
-        displacement = np.zeros((self.dimension, _n))
-        for iteration in range(self.iterations):
-            displacement *= 0
-            # loop over rows
-            for i in range(A.shape[0]):
-                if i in self.fixed:
-                    continue
-                # difference between this row's node position and all others
-                delta = (layout[i] - layout).T
-                # distance between points
-                distance = np.sqrt((delta**2).sum(axis=0))
-                # enforce minimum distance of 0.01
-                distance = np.where(distance < 0.01, 0.01, distance)
-                # the adjacency matrix row
-                Ai = np.asarray(A.getrowview(i).toarray())
-                # displacement "force"
-                displacement[:, i] +=\
-                    (delta * (k * k / distance**2 - Ai * distance / k)).sum(axis=1)
-            # update positions
-            length = np.sqrt((displacement**2).sum(axis=0))
-            length = np.where(length < 0.01, 0.1, length)
-            delta_layout = (displacement * t / length).T
-            layout += delta_layout
-            # cool temperature
-            t -= dt
-            err = np.linalg.norm(delta_layout) / _n
-            if err < self.threshold:
-                break
+        # keep the fixed nodes at their positions
+        bounds = None
+        if self.fixed is not None:
+            bounds = [(None, None)] * layout.size
+            for i in self.fixed:
+                for d in range(self.dimension):
+                    j = i * self.dimension + d
+                    bounds[j] = (layout.flat[j], layout.flat[j])
+
+        # minimize the energy of the system instead of the cooling scheme
+        result = minimize(_fr_energy_and_grad, layout.ravel(),
+                          args=(self.edges, k, self.dimension),
+                          jac=True, method='L-BFGS-B', bounds=bounds,
+                          options={'maxiter': self.iterations,
+                                   'gtol': self.threshold})
+        layout = result.x.reshape(_n, self.dimension)
         return layout
 
 
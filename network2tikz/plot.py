@@ -26,16 +26,123 @@
 # =============================================================================
 
 import os
-import subprocess
-import errno
-import webbrowser
+import sys
+import hashlib
+import shutil
+import threading
+from itertools import chain
+from collections import namedtuple
+from functools import lru_cache
 
 from . import logger
 from .exceptions import CnetError
-from .drawing import TikzNetworkDrawer
 
 log = logger(__name__)
 
+# savers of the output types and their options given as (method, options)
+OUTPUT_TYPES = {
+    'csv': ('save_csv', ()),
+    'dat': ('save_csv', ()),
+    'tex': ('save_tex', ('standalone',)),
+    'pdf': ('save_pdf', ('clean', 'clean_tex', 'compiler', 'compiler_args',
+                         'silent', 'pdf_cache')),
+}
+
+# LaTeX compilers tried in this order if no compiler is given, together with
+# their arguments
+LATEX_COMPILERS = (
+    ('latexmk', ['--pdf']),
+    ('pdflatex', []),
+)
+
+# endings of the files created during the compilation, removed with clean
+CLEAN_EXTENSIONS = frozenset(['aux', 'log', 'out', 'fls', 'fdb_latexmk'])
+
+# parts of a file name, e.g. ('plots', 'network', 'pdf') for plots/network.pdf
+FileName = namedtuple('FileName', ['directory', 'stem', 'ext'])
+
+# directory of the compiled pdf files kept with the option pdf_cache
+PDF_CACHE_DIR = os.path.join(
+    os.environ.get('XDG_CACHE_HOME',
+                   os.path.join(os.path.expanduser('~'), '.cache')),
+    'network2tikz')
+
+# directory of the temporary files of shown networks (in memory if possible)
+PREVIEW_DIR = '/dev/shm' if os.path.isdir('/dev/shm') else None
+
+# temporary directories of the shown networks, removed with the next preview
+_PREVIEWS = []
+
+
+def _open(filename):
+    """Open the file with the default application of the system.
+
+    The viewer is started as detached process, i.e. the call returns
+    immediately. If no viewer can be started, the webbrowser is used.
+
+    """
+    # the modules are only needed to show a network, not on import
+    import subprocess
+    try:
+        if sys.platform.startswith('win'):
+            os.startfile(filename)
+        else:
+            opener = 'open' if sys.platform == 'darwin' else 'xdg-open'
+            subprocess.Popen([opener, filename], stdout=subprocess.DEVNULL,
+                             stderr=subprocess.DEVNULL, start_new_session=True)
+    except OSError:
+        import webbrowser
+        from pathlib import Path
+        webbrowser.open(Path(filename).resolve().as_uri())
+
+
+def _split(filename):
+    """Returns the directory, the stem and the ending of a file name."""
+    directory, name = os.path.split(filename)
+    stem, ext = os.path.splitext(name)
+    return FileName(directory, stem, ext[1:].lower())
+
+
+@lru_cache(maxsize=None)
+def _compiler(compiler=None):
+    """Returns the first installed LaTeX compiler and its arguments.
+
+    If no compiler is given, the compilers in ``LATEX_COMPILERS`` are
+    tried. The compiler is looked up only once, i.e. repeated compilations
+    start the compiler directly. None is returned if no compiler is found.
+
+    """
+    if compiler is not None:
+        compilers = ((compiler, []),)
+    else:
+        compilers = LATEX_COMPILERS
+
+    for compiler, arguments in compilers:
+        if shutil.which(compiler) is not None:
+            return compiler, arguments
+    return None
+
+
+def _write(filename, text):
+    """Write the text to the file with the given name.
+
+    The text is encoded as a whole and written with a single call, i.e. the
+    file buffer is bypassed. The files are always utf-8 encoded (independent
+    of the locale), as expected by LaTeX. The text is written to a temporary
+    file first, which then replaces the file, so that other programs (e.g. an
+    editor or viewer watching the file) never read a partially written file.
+
+    """
+    temp = '{}.{}-{}.tmp'.format(filename, os.getpid(), threading.get_ident())
+    try:
+        with open(temp, 'wb') as f:
+            f.write(text.encode('utf-8'))
+        os.replace(temp, filename)
+    except BaseException:
+        if os.path.exists(temp):
+            os.remove(temp)
+        raise
+
 
 class Plot(object):
     """Plots the network as a tikz-network.
@@ -75,7 +182,10 @@ class Plot(object):
         and filename_edges.csv). If the filename is a tuple of strings, the
         first entry will be used to name the node list and the second entry
         for the edge list; and if no ending and no type is defined a
-        temporary pdf file is compiled and shown.
+        temporary pdf file is compiled and shown. A tuple of file names
+        containing '.tex' or '.pdf' files (e.g. ('net.tex', 'net.pdf'))
+        saves the network in all these formats, whereby the layout is only
+        computed once.
 
     type : str or None, optional (default = None)
         Type of the output file. If no ending is defined trough the filename,
@@ -208,11 +318,13 @@ class Plot(object):
     NOTE: All layout arguments can be entered with or without 'layout_' at the
     beginning, e.g. 'layout_iterations' is equal to 'iterations'
 
-    - ``layout`` : dict or string , optional (default = None)
+    - ``layout`` : dict, array or string , optional (default = None)
       A dictionary with the node positions on a 2-dimensional plane. The
       key value of the dict represents the node id while the value
       represents a tuple of coordinates (e.g. n = (x,y)). The initial
       layout can be placed anywhere on the 2-dimensional plane.
+      The positions can also be given as (n, 2) array, where the i-th row is
+      the position of the i-th node of the network.
 
       Instead of a dictionary, the algorithm used for the layout can be defined
       via a string value. Currently, supported are:
@@ -270,6 +382,16 @@ class Plot(object):
       the seed used by the random number generator, if None, the a random seed
       by created by the numpy random number generator is used.
 
+    - ``device`` : string, optional (default = 'cpu')
+      Device used to compute the Fruchterman-Reingold layout. If 'gpu' and
+      the cupy package is installed, layouts of more than 2000 nodes are
+      computed on the GPU.
+
+    - ``layout_cache`` : bool, optional (default = True)
+      Whether layouts generated with a ``seed`` are cached and reused when
+      the same network is plotted again with the same layout options. If
+      ``False``, the layout is always recomputed.
+
     **General Options:**
 
     - ``units`` : string or tuple of strings, optional (default = ('cm','pt'))
@@ -326,6 +448,16 @@ class Plot(object):
     - ``silent`` : bool, optional (default = True)
       Whether to hide compiler output or not.
 
+    - ``pdf_cache`` : bool, optional (default = False)
+      Whether compiled pdf files are cached and reused if the same network is
+      compiled again with the same options, i.e. the LaTeX compiler is skipped.
+
+    - ``show`` : bool or None, optional (default = None)
+      Whether a network plotted without file name is compiled and opened.
+      If None, this is done unless running within pytest or a CI environment
+      (i.e. the environment variable ``CI`` is set); otherwise the drawing is
+      kept and can be shown with ``plot.show()``.
+
     In the style dictionary multiple keywords can be used to address
     attributes. These keywords will be converted to an unique key word,
     used in the remaining code. This allows to keep the keywords used in
@@ -526,7 +658,6 @@ class Plot(object):
 
         self.drawers = []
         self.filename = 'default_network'
-        pass
 
     def __call__(self, network=None, filename=None, type=None, **kwds):
         """Call the plot function and plot or show the results.
@@ -545,7 +676,10 @@ class Plot(object):
             and filename_edges.csv). If the filename is a tuple of strings, the
             first entry will be used to name the node list and the second entry
             for the edge list; and if no ending and no type is defined a
-            temporary pdf file is compiled and shown.
+            temporary pdf file is compiled and shown. A tuple of file names
+            containing '.tex' or '.pdf' files (e.g. ('net.tex', 'net.pdf'))
+            saves the network in all these formats, whereby the layout is only
+            computed once and the pdf is only compiled once.
 
         type : str or None, optional (default = None)
             Type of the output file. If no ending is defined trough the filename,
@@ -562,8 +696,15 @@ class Plot(object):
         Plot
 
         """
-        self.drawers = [TikzNetworkDrawer(network, **kwds)]
-        self.save(filename, type=type, **kwds)
+        # the network is saved by a plot of its own, so that concurrent calls
+        # (e.g. from threads) do not share their drawers
+        # the drawer (and numpy) is only imported once a network is drawn
+        from .drawing import TikzNetworkDrawer
+        _plot = self.__class__()
+        _plot.drawers = [TikzNetworkDrawer(network, **kwds)]
+        _plot.save(filename, type=type, **kwds)
+        # keep the drawing, e.g. to show it later
+        self.drawers = _plot.drawers
 
     def add(self, network, **kwds):
         """Add a new network to the canvas.
@@ -583,8 +724,30 @@ class Plot(object):
         Plot
 
         """
+        from .drawing import TikzNetworkDrawer
         self.drawers.append(TikzNetworkDrawer(network, **kwds))
 
+    def update_positions(self, positions):
+        """Move the nodes of the drawn networks to new positions.
+
+        This is much faster than plotting the network again with a new layout,
+        since the styles of the nodes and edges are kept.
+
+        Parameters
+        ----------
+        positions : dict
+            New positions of the nodes, given as for the option ``layout``.
+
+        Examples
+        --------
+        >>> plot(net, 'network.tex', layout=layout_1)
+        >>> plot.update_positions(layout_2)
+        >>> plot.save('network_2.tex')
+
+        """
+        for drawer in self.drawers:
+            drawer.update_positions(positions)
+
     def save(self, filename, type=None, **kwds):
         """Saves the network.
 
@@ -598,7 +761,10 @@ class Plot(object):
             and filename_edges.csv). If the filename is a tuple of strings, the
             first entry will be used to name the node list and the second entry
             for the edge list; and if no ending and no type is defined a
-            temporary pdf file is compiled and shown.
+            temporary pdf file is compiled and shown. A tuple of file names
+            containing '.tex' or '.pdf' files (e.g. ('net.tex', 'net.pdf'))
+            saves the network in all these formats, whereby the layout is only
+            computed once and the pdf is only compiled once.
 
         type : str or None, optional (default = None)
             Type of the output file. If no ending is defined trough the filename,
@@ -630,45 +796,69 @@ class Plot(object):
         - ``silent`` : bool, optional (default = True)
           Whether to hide compiler output or not.
 
+        - ``pdf_cache`` : bool, optional (default = False)
+          Whether compiled pdf files are cached and reused if the same network is
+          compiled again with the same options, i.e. the LaTeX compiler is skipped.
+
+        - ``show`` : bool or None, optional (default = None)
+          Whether a network plotted without file name is compiled and opened.
+          If None, this is done unless running within pytest or a CI
+          environment (i.e. the environment variable ``CI`` is set); otherwise
+          the drawing is kept and can be shown with ``plot.show()``.
+
         """
         if filename is None:
             filename = self.filename
-        # get properties for the latex compiler
-        _clean = kwds.get('clean', True)
-        _clean_tex = kwds.get('clean_tex', True)
-        _compiler = kwds.get('compiler', None)
-        _compiler_args = kwds.get('compiler_arg', None)
-        _silent = kwds.get('silent', True)
-
-        if isinstance(filename, tuple) or isinstance(filename, list) or \
-                filename.endswith('.csv') or type == 'csv' or \
-                filename.endswith('.dat') or type == 'dat':
-            # log.debug('Create csv files')
-            self.save_csv(filename)
-        elif filename == 'default_network' and type is None:
+
+        if isinstance(filename, (tuple, list)):
+            # save the already drawn network in all given output formats
+            if any(_split(f).ext in ('tex', 'pdf') for f in filename):
+                # the pdf files are compiled first, so that removing their
+                # tex files (with clean_tex) does not remove a requested one
+                compiled = None
+                for _filename in sorted(
+                        filename, key=lambda f: _split(f).ext != 'pdf'):
+                    _name = _split(_filename)
+                    if _name.ext != 'pdf':
+                        self.save(_filename, **kwds)
+                        continue
+                    # the network is compiled only once, further pdf files
+                    # are copies of the first one
+                    _pdf = os.path.join(_name.directory, _name.stem + '.pdf')
+                    if compiled is None:
+                        self.save(_filename, **kwds)
+                        compiled = _pdf
+                    elif os.path.abspath(_pdf) != os.path.abspath(compiled):
+                        shutil.copyfile(compiled, _pdf)
+            else:
+                self.save_csv(filename)
+            return
+
+        if filename == self.filename and type is None:
             # log.debug('Show the network')
-            # get current directory
-            current_dir = os.getcwd()
-            # create temp file name
-            temp_filename = os.path.join(current_dir, filename)
-            # save a pdf file
-            self.save_pdf(filename, clean=_clean, clean_tex=_clean_tex,
-                          compiler=_compiler, compiler_args=_compiler_args,
-                          silent=_silent)
-            # open the file
-            webbrowser.open(r'file:///'+temp_filename+'.pdf')
-            # self.show(filename)
-        elif filename.endswith('.tex') or type == 'tex':
-            # log.debug('Create tex file')
-            standalone = kwds.get('standalone', True)
-            self.save_tex(filename, standalone=standalone)
-        elif filename.endswith('.pdf') or type == 'pdf':
-            # log.debug('Create pdf plot')
-            self.save_pdf(filename, clean=_clean, clean_tex=_clean_tex,
-                          compiler=_compiler, compiler_args=_compiler_args,
-                          silent=_silent)
+            _show = kwds.get('show', None)
+            if _show is None:
+                # tests and CI runs never open a viewer
+                _show = 'PYTEST_CURRENT_TEST' not in os.environ and \
+                    'CI' not in os.environ
+            if _show:
+                _, options = OUTPUT_TYPES['pdf']
+                self.show(**{key: kwds[key] for key in options
+                             if key in kwds})
+            else:
+                log.info('The network is not shown (in a test or CI run), '
+                         'use plot.show() or show=True to open it.')
+            return
+
+        # the file ending takes precedence over the given type
+        ext = _split(filename).ext
+        saver = OUTPUT_TYPES.get(ext, None) or OUTPUT_TYPES.get(type, None)
+        if saver is None:
+            log.warning('No valid output option was chosen!')
         else:
-            log.warn('No valid output option was chosen!')
+            saver, options = saver
+            getattr(self, saver)(filename, **{key: kwds[key] for key in options
+                                              if key in kwds})
 
     def save_tex(self, filename, standalone=True):
         """Save the network as a tex file.
@@ -685,6 +875,19 @@ class Plot(object):
            standalone is false, only the tikz environment is stored in the tex
            file, and can be imported in an existing tex file.
 
+        """
+        _write(filename, self.tex(standalone=standalone))
+
+    def tex(self, standalone=True):
+        """Returns the tex code of the network.
+
+        Parameters
+        ----------
+        standalone : bool, optional (default = True)
+           If this option is true, the code of a standalone latex file is
+           returned, otherwise only the tikz environment. See also
+           :py:meth:`save_tex`.
+
         """
         latex_header = '\\documentclass{standalone}\n' + \
             '\\usepackage{tikz-network}\n' + \
@@ -707,30 +910,31 @@ class Plot(object):
         #                           canvas[0] - margins['right'],
         #                           canvas[1] - margins['top'])
 
-        with open(filename, 'w') as f:
-            if standalone:
-                f.write(latex_header)
-            f.write(latex_begin_tikz)
-            f.write(latex_canvas)
-            # f.write(latex_margins)
-
-            for drawer in self.drawers:
-                # TODO: Find a better implementation for the x and y shifts
-                if len(self.drawers) > 1:
-                    _x = drawer.general_attributes.get('xshift', '0cm')
-                    _y = drawer.general_attributes.get('yshift', '0cm')
-                    f.write(latex_begin_scope +
-                            '[xshift={},yshift={}]\n'.format(_x, _y))
-                for node in drawer.node_drawer:
-                    f.write(node.draw())
-                for edge in drawer.edge_drawer:
-                    f.write(edge.draw())
-                if len(self.drawers) > 1:
-                    f.write(latex_end_scope)
-
-            f.write(latex_end_tikz)
-            if standalone:
-                f.write(latex_footer)
+        # collect the whole output first and write it at once; the header is
+        # fixed and every environment is closed here, so the code needs no
+        # post-processing. Identical consecutive lines are not merged either,
+        # since they are parallel edges (drawn twice, e.g. with opacity)
+        parts = [latex_header] if standalone else []
+        parts.append(latex_begin_tikz)
+        parts.append(latex_canvas)
+        # parts.append(latex_margins)
+
+        for drawer in self.drawers:
+            # TODO: Find a better implementation for the x and y shifts
+            if len(self.drawers) > 1:
+                _x = drawer.general_attributes.get('xshift', '0cm')
+                _y = drawer.general_attributes.get('yshift', '0cm')
+                parts.append(latex_begin_scope +
+                             '[xshift={},yshift={}]\n'.format(_x, _y))
+            parts.append(drawer.tex())
+            if len(self.drawers) > 1:
+                parts.append(latex_end_scope)
+
+        parts.append(latex_end_tikz)
+        if standalone:
+            parts.append(latex_footer)
+
+        return ''.join(parts)
 
     def save_csv(self, filename):
         """Save the network as multiple csv files.
@@ -747,34 +951,32 @@ class Plot(object):
         """
         # if file name is a string get base name
         if isinstance(filename, str):
-            basename = os.path.splitext(os.path.basename(filename))[0]
+            basename = _split(filename).stem
             basename_n = basename + '_nodes'
             basename_e = basename + '_edges'
         # if the file name is a tuple, use the first part for the node list and
         # the second part for the edge list.
         elif isinstance(filename, tuple) or isinstance(filename, list):
-            basename_n = os.path.splitext(os.path.basename(filename[0]))[0]
-            basename_e = os.path.splitext(os.path.basename(filename[1]))[0]
+            basename_n = _split(filename[0]).stem
+            basename_e = _split(filename[1]).stem
         else:
             log.error('File name is not correct specified!')
             raise CnetError
 
-        # write node list
-        with open(basename_n+'.csv', 'w') as f:
-            f.write(self.drawers[0].node_drawer[0].head())
-            for drawer in self.drawers:
-                for node in drawer.node_drawer:
-                    f.write(node.draw(mode='csv'))
+        # the header of the lists is given by the first drawer
+        text = ''.join(chain.from_iterable(
+            drawer.iter_node_csv(head=i == 0)
+            for i, drawer in enumerate(self.drawers)))
+        _write(basename_n+'.csv', text)
 
-        # write edge list
-        with open(basename_e+'.csv', 'w') as f:
-            f.write(self.drawers[0].edge_drawer[0].head())
-            for drawer in self.drawers:
-                for edge in drawer.edge_drawer:
-                    f.write(edge.draw(mode='csv'))
+        text = ''.join(chain.from_iterable(
+            drawer.iter_edge_csv(head=i == 0)
+            for i, drawer in enumerate(self.drawers)))
+        _write(basename_e+'.csv', text)
 
     def save_pdf(self, filename, clean=True, clean_tex=True,
-                 compiler=None, compiler_args=None, silent=True):
+                 compiler=None, compiler_args=None, silent=True,
+                 pdf_cache=False):
         """Save the network as a tex file and compile the pdf.
 
         Note
@@ -806,100 +1008,127 @@ class Plot(object):
         silent: bool, optional (default = True)
             Whether to hide compiler output or not.
 
+        pdf_cache: bool, optional (default = False)
+            Whether compiled pdf files are kept in the cache directory
+            (``PDF_CACHE_DIR``) and reused if the same tex code is compiled
+            again with the same compiler options.
+
         """
         if compiler_args is None:
             compiler_args = []
 
         # get directories and file name
-        current_dir = os.getcwd()
-        output_dir = os.path.dirname(filename)
+        output_dir, basename, _ = _split(filename)
         # check if output dir exists if not use the base dir
         if not os.path.exists(output_dir):
-            output_dir = current_dir
-        basename = os.path.splitext(os.path.basename(filename))[0]
-
-        # change to output dir
-        os.chdir(output_dir)
+            output_dir = ''
+        # the compilers run in the output dir (given as absolute path), the
+        # working directory of the process is not changed
+        output_dir = os.path.abspath(output_dir)
+        path = os.path.join(output_dir, basename)
 
         # save the tex file
-        self.save_tex(basename+'.tex', standalone=True)
-
-        if compiler is not None:
-            compilers = ((compiler, []),)
-        else:
-            latexmk_args = ['--pdf']
-
-            compilers = (
-                ('latexmk', latexmk_args),
-                ('pdflatex', [])
-            )
-
-        main_arguments = ['--interaction=nonstopmode', basename + '.tex']
-
-        for compiler, arguments in compilers:
-            command = [compiler] + arguments + compiler_args + main_arguments
-
-            try:
-                output = subprocess.check_output(command,
-                                                 stderr=subprocess.STDOUT)
-            except:
-                # If compiler does not exist, try next in the list
-                continue
-            else:
-                if not silent:
-                    print(output.decode())
-
-            if clean:
-                try:
-                    # Try latexmk cleaning first
-                    subprocess.check_output(['latexmk', '-c', basename],
-                                            stderr=subprocess.STDOUT)
-                except (OSError, IOError, subprocess.CalledProcessError) as e:
-                    # Otherwise just remove some file extensions.
-                    extensions = ['aux', 'log', 'out', 'fls',
-                                  'fdb_latexmk']
-
-                    for ext in extensions:
-                        try:
-                            os.remove(basename + '.' + ext)
-                        except (OSError, IOError) as e:
-                            if e.errno != errno.ENOENT:
-                                raise
-            # remove the tex file
-            if clean_tex:
-                os.remove(basename + '.tex')
-            # Compilation has finished, so no further compilers have to be tried
-            break
-
-        else:
+        text = self.tex(standalone=True)
+        _write(path+'.tex', text)
+
+        # reuse the pdf compiled from the same tex code and options
+        if pdf_cache:
+            digest = hashlib.blake2b(text.encode(), digest_size=16)
+            digest.update(repr((compiler, compiler_args)).encode())
+            cached = os.path.join(PDF_CACHE_DIR, digest.hexdigest() + '.pdf')
+            if os.path.isfile(cached):
+                shutil.copyfile(cached, path + '.pdf')
+                if clean_tex:
+                    os.remove(path + '.tex')
+                return
+
+        # take the first installed compiler
+        _found = _compiler(compiler)
+        if _found is None:
             # Notify user that none of the compilers worked.
             log.error('No LaTex compiler was found! Either specify a LaTex '
                       'compiler or make sure you have latexmk or pdfLaTex'
                       ' installed.')
             raise CnetError
+        compiler, arguments = _found
+
+        # the compiler is the only external process, i.e. loaded on first use
+        import subprocess
+
+        # the compiler stops at the first error (instead of continuing with
+        # a broken document) and writes nothing to the terminal if silent
+        interaction = 'batchmode' if silent else 'nonstopmode'
+        main_arguments = ['--interaction=' + interaction, '--halt-on-error',
+                          basename + '.tex']
+        # the compiler output is discarded (not piped) if silent
+        output = subprocess.DEVNULL if silent else None
+
+        command = [compiler] + arguments + compiler_args + main_arguments
+        if subprocess.run(command, cwd=output_dir, stdout=output,
+                          stderr=subprocess.STDOUT).returncode != 0:
+            log.error('The compilation of "{}" with {} failed!'.format(
+                path + '.tex', compiler))
+            raise CnetError
 
-        # change back to current dir
-        os.chdir(current_dir)
-
-    def show(self):
+        if pdf_cache:
+            # the pdf is copied to a temporary name first, so that concurrent
+            # plots never read a partially written pdf from the cache
+            os.makedirs(PDF_CACHE_DIR, exist_ok=True)
+            temp = '{}.{}-{}'.format(cached, os.getpid(), threading.get_ident())
+            shutil.copyfile(path + '.pdf', temp)
+            os.replace(temp, cached)
+
+        if clean:
+            # the auxiliary files are removed directly, instead of starting
+            # latexmk a second time (with -c) only to clean up; they are
+            # found with a single pass over the directory
+            prefix = basename + '.'
+            with os.scandir(output_dir) as entries:
+                names = [entry.name for entry in entries
+                         if entry.name.startswith(prefix) and
+                         entry.name[len(prefix):] in CLEAN_EXTENSIONS]
+            for name in names:
+                os.remove(os.path.join(output_dir, name))
+        # remove the tex file
+        if clean_tex:
+            os.remove(path + '.tex')
+
+    def show(self, **kwds):
         """Show the compiled network.
 
         Create a tex file and compile the pdf out of it. After this is done the
-        pdf will be automatically opened.
+        pdf will be automatically opened with the default viewer. The files
+        are stored in a temporary directory, which is kept after the program
+        exits (the viewer is started as a separate process and may read the
+        pdf later). It is removed with the next call of this function within
+        the same program, otherwise it is left to the cleanup of the
+        temporary files of the system.
+
+        Parameters
+        ----------
+        kwds : keyword arguments, optional
+            Options for the LaTeX compiler, see :py:meth:`save_pdf`.
 
         See Also
         --------
         save_pdf
 
         """
-        # get current directory
-        current_dir = os.getcwd()
+        import tempfile
+        # the directory of the previous preview is not needed anymore, since
+        # its viewer has loaded the pdf in the meantime
+        while _PREVIEWS:
+            shutil.rmtree(_PREVIEWS.pop(), ignore_errors=True)
+        # create a temporary directory, which is not removed when the program
+        # exits, since the (detached) viewer may not have loaded the pdf yet
+        temp_dir = tempfile.mkdtemp(prefix='n2t_', dir=PREVIEW_DIR)
+        _PREVIEWS.append(temp_dir)
         # create temp file name
-        temp_filename = os.path.join(current_dir, self.filename)
+        temp_filename = os.path.join(temp_dir, self.filename)
         # save a pdf file
-        self.save_pdf(temp_filename)
+        self.save_pdf(temp_filename, **kwds)
         # open the file
-        webbrowser.open(r'file:///'+temp_filename+'.pdf')
+        _open(temp_filename+'.pdf')
 
 
 # =============================================================================
@@ -29,6 +29,27 @@ from . import logger
 from .exceptions import CnetNotImplemented, CnetError
 log = logger(__name__)
 
+# factors (a, b, c) of the supported conversions, where a measure is converted
+# as measure * a * b / c (i.e. in the same order as the single conversions)
+FACTORS = {
+    ('cm', 'cm'): (1, 1, 1),
+    ('pt', 'pt'): (1, 1, 1),
+    ('mm', 'mm'): (1, 1, 1),
+    ('px', 'px'): (1, 1, 1),
+    # to cm
+    ('mm', 'cm'): (1, 1, 10),
+    ('pt', 'cm'): (0.352778, 1, 10),
+    ('px', 'cm'): (0.26458333333719, 1, 10),
+    # to pt
+    ('px', 'pt'): (0.75, 1, 1),
+    ('mm', 'pt'): (2.83465, 1, 1),
+    ('cm', 'pt'): (2.83465, 10, 1),
+    # to px
+    ('mm', 'px'): (3.779527559, 1, 1),
+    ('cm', 'px'): (10, 3.779527559, 1),
+    ('pt', 'px'): (4, 1, 3),
+}
+
 
 class UnitConverter(object):
     """Convert units.
@@ -79,6 +100,9 @@ class UnitConverter(object):
         self.input_unit = input_unit
         self.output_unit = output_unit
         self.digits = digits
+        # the factors are looked up once, unsupported units are reported
+        # when a measure is converted
+        self._factors = FACTORS.get((input_unit, output_unit), None)
 
     def __call__(self, value):
         """Returns the converted measure.
@@ -144,38 +168,13 @@ class UnitConverter(object):
                       ' converted to an other unit!.'.format(value))
             raise CnetError
 
-        # to cm
-        if self.input_unit == 'mm' and self.output_unit == 'cm':
-            value = measure/10
-        elif self.input_unit == 'pt' and self.output_unit == 'cm':
-            value = self.pt_to_mm(measure)/10
-        elif self.input_unit == 'px' and self.output_unit == 'cm':
-            value = self.px_to_mm(measure)/10
-        elif self.input_unit == 'cm' and self.output_unit == 'cm':
-            value = measure
-        # to pt
-        elif self.input_unit == 'px' and self.output_unit == 'pt':
-            value = self.px_to_pt(measure)
-        elif self.input_unit == 'mm' and self.output_unit == 'pt':
-            value = self.mm_to_pt(measure)
-        elif self.input_unit == 'cm' and self.output_unit == 'pt':
-            value = self.mm_to_pt(measure)*10
-        elif self.input_unit == 'pt' and self.output_unit == 'pt':
-            value = measure
-        # to px
-        elif self.input_unit == 'mm' and self.output_unit == 'px':
-            value = self.mm_to_px(measure)
-        elif self.input_unit == 'cm' and self.output_unit == 'px':
-            value = self.mm_to_px(10*measure)
-        elif self.input_unit == 'pt' and self.output_unit == 'px':
-            value = measure*4/3
-        elif self.input_unit == 'px' and self.output_unit == 'px':
-            value = measure
-        else:
+        if self._factors is None:
             log.error('The conversion from "{}" to "{}" is currently not '
                       'supported!'.format(self.input_unit,
                                           self.output_unit))
             raise CnetNotImplemented
+        a, b, c = self._factors
+        value = measure * a * b / c
 
         # return the converted measure
         return round(value, self.digits)
@@ -42,11 +42,12 @@ setup(
     name='network2tikz',
     version=about['__version__'],
     packages=find_packages(),
+    package_data={'network2tikz': ['*.pyi']},
     url='https://github.com/hackl/network2tikz',
     download_url = 'https://pypi.org/project/network2tikz',
     author=about['__author__'],
     author_email=about['__email__'],
-    install_requires=['numpy'],
+    install_requires=['numpy', 'scipy'],
     description='A converter that takes a network (cnet, igraph, networkx, pathpy, ...) and creates a tikz-network for smooth integration into LaTeX.',
     long_description = readme,
     long_description_content_type='text/markdown',
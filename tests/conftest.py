@@ -0,0 +1,28 @@
+#!/usr/bin/python -tt
+# -*- coding: utf-8 -*-
+# =============================================================================
+# File      : conftest.py -- Shared fixtures for the test environment
+#
+# Copyright (c) 2018 Jürgen Hackl <hackl@ibi.baug.ethz.ch>
+#               http://www.ibi.ethz.ch
+# =============================================================================
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def _output_dir(tmp_path, monkeypatch):
+    # every test writes its network.tex/csv/pdf into its own directory so
+    # that the tests can run in parallel (e.g. with pytest -n auto)
+    monkeypatch.chdir(tmp_path)
+
+
+# =============================================================================
+# eof
+#
+# Local Variables:
+# mode: python
+# mode: linum
+# mode: auto-fill
+# fill-column: 80
+# End:
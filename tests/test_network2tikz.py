@@ -34,6 +34,7 @@ sys.path.insert(0, os.path.abspath(
 #from cnet import Node, Edge, Network
 from network2tikz.canvas import Canvas
 from network2tikz.units import UnitConverter
+from network2tikz.drawing import TikzNetworkDrawer
 
 
 def test_canvas():
@@ -93,6 +94,143 @@ def test_unit_converter():
         mm2m = UnitConverter('mm', 'm')
         mm2m(100)
 
+
+def test_rename_attributes():
+    kwds = TikzNetworkDrawer.rename_attributes(
+        vertex_size=1, v_color='red', link_width=2, e_label='e',
+        margins=1, bbox=(4, 4), unit='mm', edge_curved=.1)
+
+    assert kwds == {'node_size': 1, 'node_color': 'red', 'edge_width': 2,
+                    'edge_label': 'e', 'margins': 1, 'canvas': (4, 4),
+                    'units': 'mm', 'edge_curved': .1}
+
+    kwds = TikzNetworkDrawer.rename_attributes(margin=2, margins=1)
+    assert kwds == {'margins': 1}
+
+
+def test_package_exports():
+    # the submodules are imported first, in a new interpreter
+    import subprocess
+    path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+    code = '\n'.join([
+        'import sys',
+        'sys.path.insert(0, {!r})'.format(path),
+        'import network2tikz.layout',
+        'from network2tikz.plot import Plot',
+        'import network2tikz',
+        'from network2tikz import plot, layout',
+        'import networkx as nx',
+        'plot(nx.path_graph(3), "network.tex", layout="fr", seed=1)',
+        'assert callable(network2tikz.layout) and callable(layout)',
+        'assert isinstance(network2tikz.plot, Plot)',
+        'assert isinstance(plot, Plot)',
+    ])
+    subprocess.run([sys.executable, '-c', code], check=True)
+
+
+def test_fr_energy_gradient(monkeypatch):
+    import importlib
+    import numpy as np
+    from scipy.optimize import check_grad
+    from scipy.sparse import random
+    _layout = importlib.import_module('network2tikz.layout')
+    # exact repulsion, i.e. the energy is differentiable
+    monkeypatch.setattr(_layout, 'BARNES_HUT_THETA', 0.0)
+
+    # directed network, i.e. an asymmetric adjacency matrix
+    A = random(60, 60, density=.05, format='coo', random_state=1)
+    edges = (A.row.astype(np.int32), A.col.astype(np.int32),
+             A.data.astype(np.float32))
+    x = np.random.default_rng(1).random(120)
+    k = np.sqrt(1 / 60)
+
+    def energy(x):
+        return _layout._fr_energy_and_grad(x, edges, k, 2)[0]
+
+    def gradient(x):
+        return _layout._fr_energy_and_grad(x, edges, k, 2)[1]
+
+    assert check_grad(energy, gradient, x) < 1e-5 * np.linalg.norm(
+        gradient(x))
+
+
+def test_barnes_hut_repulsion():
+    import importlib
+    import numpy as np
+    _layout = importlib.import_module('network2tikz.layout')
+
+    x = np.random.default_rng(1).random((50, 2))
+    k = np.sqrt(1 / 50)
+    # exact repulsion between all pairs of nodes
+    delta = x[:, np.newaxis] - x[np.newaxis]
+    distance = np.maximum(np.einsum('ijk,ijk->ij', delta, delta), 1e-4)
+    np.fill_diagonal(distance, 1)
+    force = np.einsum('ijk,ij->ik', delta, k * k / distance)
+    energy = -k * k / 4 * np.log(distance).sum()
+
+    # all cells are opened for theta = 0
+    _force, _energy = _layout._barnes_hut_repulsion(x, k, 0.0)
+    assert np.allclose(_force, force) and np.isclose(_energy, energy)
+
+    # the approximation stays close to the exact forces
+    _force, _ = _layout._barnes_hut_repulsion(x, k, _layout.BARNES_HUT_THETA)
+    assert np.linalg.norm(_force - force) < .1 * np.linalg.norm(force)
+
+
+def test_fruchterman_reingold_solvers(monkeypatch):
+    import importlib
+    import numpy as np
+    import networkx as nx
+    _layout = importlib.import_module('network2tikz.layout')
+    net = nx.gnm_random_graph(150, 400, seed=1)
+
+    def positions(**kwds):
+        pos = _layout.layout(net, layout='fr', seed=1, iterations=10,
+                             cache=False, **kwds)
+        return np.array([pos[n] for n in net])
+
+    # sparse solver, i.e. the energy is minimized
+    monkeypatch.setattr(_layout, 'NUMBA_MIN_NODES', 10**9)
+    big = nx.gnm_random_graph(600, 1200, seed=1)
+    pos = _layout.layout(big, layout='fr', seed=1, cache=False)
+    assert len(pos) == 600 and np.isfinite(list(pos.values())).all()
+    monkeypatch.undo()
+
+    # the iterations of the GPU solver (run with numpy as array module) and
+    # the pure python iterations of the compiled solver
+    A = nx.adjacency_matrix(nx.gnm_random_graph(40, 80, seed=1)).tocoo()
+    args = (A.row.astype(np.int32), A.col.astype(np.int32),
+            A.data.astype(np.float32), np.zeros(40, dtype=bool),
+            .15, .1, .002, 10, 1e-4)
+    x = np.random.default_rng(1).random((40, 2))
+    assert np.allclose(_layout._fr_array_iterate(np, x.copy(), *args),
+                       _layout._fr_iterate(x.copy(), *args))
+
+    # the compiled solver gives the same layout as the dense one
+    pytest.importorskip('numba')
+    compiled = positions()
+    monkeypatch.setattr(_layout, 'NUMBA_MIN_NODES', 10**9)
+    assert np.allclose(compiled, positions(), atol=1e-8)
+
+
+def test_fruchterman_reingold_initial_layout():
+    import networkx as nx
+    from network2tikz import layout
+    positions = {0: (1., 2.), 1: (3., 1.), 2: (0., 0.)}
+
+    def initial(net, **kwds):
+        pos = layout(net, layout='fr', positions=positions, **kwds)
+        return {n: tuple(p) for n, p in pos.items()} == \
+            {n: positions[n] for n in net}
+
+    # without edges, with a single node and with zero iterations
+    assert initial(nx.empty_graph(3))
+    net = nx.Graph()
+    net.add_edge(0, 0)
+    assert initial(net)
+    assert initial(nx.path_graph(3), iterations=0)
+
+
 # =============================================================================
 # eof
 #
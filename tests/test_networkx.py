@@ -60,22 +60,22 @@ def net():
     return net
 
 
-@pytest.fixture
+@pytest.fixture(scope='module')
 def color_dict():
     return {"m": "blue", "f": "red"}
 
 
-@pytest.fixture
+@pytest.fixture(scope='module')
 def shape_dict():
     return {"m": "circle", "f": "rectangle"}
 
 
-@pytest.fixture
+@pytest.fixture(scope='module')
 def style_dict():
     return {"m": "{shading=ball}", "f": None}
 
 
-@pytest.fixture
+@pytest.fixture(scope='module')
 def _layout():
     layout = {'a': (4.3191, -3.5352), 'b': (0.5292, -0.5292),
               'c': (8.6559, -3.8008), 'd': (12.4117, -7.5239),
@@ -96,12 +96,12 @@ def test_plot(net, _layout, color_dict):
     visual_style['layout'] = _layout
     visual_style['vertex_size'] = .5
     visual_style['vertex_color'] = {n: color_dict[g]
-                                    for n, g in nx.get_node_attributes(net, 'gender').items()}
+                                    for n, g in net.nodes(data='gender')}
     visual_style['vertex_opacity'] = .7
     visual_style['vertex_label'] = nx.get_node_attributes(net, 'name')
     visual_style['vertex_label_position'] = 'below'
-    visual_style['edge_width'] = {
-        e: 1 + 2 * int(f) for e, f in nx.get_edge_attributes(net, 'is_formal').items()}
+    visual_style['edge_width'] = {(u, v): 1 + 2 * int(f)
+                                  for u, v, f in net.edges(data='is_formal')}
     visual_style['edge_curved'] = 0.1
     visual_style['canvas'] = (8, 8)
     visual_style['margin'] = 1
@@ -122,7 +122,7 @@ def test_plot_all_options(net, _layout, color_dict, shape_dict, style_dict):
     # -----------
     visual_style['vertex_size'] = 5
     visual_style['vertex_color'] = {n: color_dict[g]
-                                    for n, g in nx.get_node_attributes(net, 'gender').items()}
+                                    for n, g in net.nodes(data='gender')}
     visual_style['vertex_opacity'] = .7
     visual_style['vertex_label'] = nx.get_node_attributes(net, 'name')
     visual_style['vertex_label_position'] = 'below'
@@ -130,9 +130,9 @@ def test_plot_all_options(net, _layout, color_dict, shape_dict, style_dict):
     visual_style['vertex_label_color'] = 'gray'
     visual_style['vertex_label_size'] = 3
     visual_style['vertex_shape'] = {n: shape_dict[g]
-                                    for n, g in nx.get_node_attributes(net, 'gender').items()}
+                                    for n, g in net.nodes(data='gender')}
     visual_style['vertex_style'] = {n: style_dict[g]
-                                    for n, g in nx.get_node_attributes(net, 'gender').items()}
+                                    for n, g in net.nodes(data='gender')}
     visual_style['vertex_label_off'] = {'e': True}
     visual_style['vertex_math_mode'] = {'a': True}
     visual_style['vertex_label_as_id'] = {'f': True}
@@ -140,8 +140,8 @@ def test_plot_all_options(net, _layout, color_dict, shape_dict, style_dict):
 
     # edge styles
     # -----------
-    visual_style['edge_width'] = {
-        e: .3 + .3 * int(f) for e, f in nx.get_edge_attributes(net, 'is_formal').items()}
+    visual_style['edge_width'] = {(u, v): .3 + .3 * int(f)
+                                  for u, v, f in net.edges(data='is_formal')}
     visual_style['edge_color'] = 'black'
     visual_style['edge_opacity'] = .8
     visual_style['edge_curved'] = 0.1
@@ -182,6 +182,15 @@ def test_plot_all_options(net, _layout, color_dict, shape_dict, style_dict):
     plot(net, **visual_style)
 
 
+def test_plot_multiple_outputs(net):
+
+    plot(net, ('network.tex', 'network.csv'), layout='fr', seed=1)
+
+    assert os.path.isfile('network.tex')
+    assert os.path.isfile('network_nodes.csv')
+    assert os.path.isfile('network_edges.csv')
+
+
 def test_layout(net):
 
     layout_style = {}
@@ -192,6 +201,116 @@ def test_layout(net):
     plot(net, layout=_layout)
 
 
+def test_layout_fixed(net):
+
+    layout_style = {}
+    layout_style['layout'] = 'fr'
+    layout_style['seed'] = 1
+    layout_style['positions'] = {'a': (0, 0), 'g': (2, 2)}
+    layout_style['fixed'] = ['a', 'g']
+    _layout = layout(net, **layout_style)
+
+    assert tuple(_layout['a']) == (0, 0)
+    assert tuple(_layout['g']) == (2, 2)
+    assert len(_layout) == 7
+
+
+def test_layout_cache(net):
+    from network2tikz.drawing import TikzNetworkDrawer
+    from network2tikz.layout import _LAYOUT_CACHE
+
+    _LAYOUT_CACHE.clear()
+    first = TikzNetworkDrawer(net, layout='fr', seed=1)
+    second = TikzNetworkDrawer(net, layout='fr', seed=1)
+    assert len(_LAYOUT_CACHE) == 1
+    assert first.layout == second.layout
+
+    TikzNetworkDrawer(net, layout='fr', seed=2)
+    TikzNetworkDrawer(net, layout='fr', seed=3, layout_cache=False)
+    assert len(_LAYOUT_CACHE) == 2
+
+    _layout = layout(net, layout='fr', seed=1)
+    assert len(_LAYOUT_CACHE) == 2
+    layout(net, layout='fr', seed=4, layout_cache=False)
+    assert len(_LAYOUT_CACHE) == 2
+    assert layout(net, layout='fr', seed=4).keys() == _layout.keys()
+    assert len(_LAYOUT_CACHE) == 3
+
+
+def test_drawing_cache(net, _layout):
+    from network2tikz.drawing import TikzNetworkDrawer
+
+    first = TikzNetworkDrawer(net, layout=_layout, node_color='red')
+    second = TikzNetworkDrawer(net, layout=_layout, node_color='red')
+    assert first.tex() is second.tex()
+
+    net.add_edge('b', 'g')
+    third = TikzNetworkDrawer(net, layout=_layout, node_color='red')
+    assert len(third.edges) == len(first.edges) + 1
+
+    # equal values of different types are drawn differently
+    first = TikzNetworkDrawer(net, layout=_layout, edge_opacity=1,
+                              node_label=1)
+    second = TikzNetworkDrawer(net, layout=_layout, edge_opacity=1.0,
+                               node_label=True)
+    assert first.tex() != second.tex()
+
+
+def test_drawing_cache_plot(net, _layout):
+    from network2tikz.drawing import TikzNetworkDrawer
+
+    drawn = []
+    draw = TikzNetworkDrawer.draw
+    TikzNetworkDrawer.draw = lambda self: drawn.append(draw(self))
+    try:
+        for filename in ['network.tex', 'network.csv', 'network.tex', None]:
+            plot(net, filename, layout=_layout, node_color='red')
+    finally:
+        TikzNetworkDrawer.draw = draw
+    assert len(drawn) == 1
+
+
+def test_partial_edge_curved(net, _layout):
+    # edges without a curvature (missing in the dict or beyond the list)
+    for curved in [{('a', 'b'): .1, ('c', 'd'): -.5}, [.1, -.5, 0, 1, 2, .3]]:
+        plot(net, ('network.tex', 'network.csv'), layout=_layout,
+             edge_curved=curved)
+        with open('network.tex') as tex, open('network_edges.csv') as csv:
+            text = tex.read() + csv.read()
+        assert 'nan' not in text and 'bend=' in text
+
+
+def test_numpy_values(net, _layout):
+    import numpy as np
+    from network2tikz.drawing import TikzNetworkDrawer
+
+    ages = nx.get_node_attributes(net, 'age')
+    sizes = np.array([ages[n] for n in net.nodes]) / 50
+    drawer = TikzNetworkDrawer(net, layout=_layout, node_size=sizes,
+                               edge_width=np.float32(2))
+    assert drawer.tex() == TikzNetworkDrawer(
+        net, layout=_layout, node_size=sizes.tolist(), edge_width=2.0).tex()
+
+    positions = np.array([_layout[n] for n in net.nodes])
+    assert TikzNetworkDrawer(net, layout=positions).tex() == \
+        TikzNetworkDrawer(net, layout=_layout).tex()
+
+
+def test_update_positions(net, _layout):
+    from network2tikz.drawing import TikzNetworkDrawer
+
+    moved = {n: (y, x) for n, (x, y) in _layout.items()}
+    drawer = TikzNetworkDrawer(net, layout=_layout, edge_curved=.1)
+    other = TikzNetworkDrawer(net, layout=_layout, edge_curved=.1)
+    tex = other.tex()
+    drawer.update_positions(moved)
+
+    assert drawer.tex() == TikzNetworkDrawer(
+        net, layout=moved, edge_curved=.1).tex()
+    assert other.tex() == tex
+    assert TikzNetworkDrawer(net, layout=_layout, edge_curved=.1).tex() == tex
+
+
 # =============================================================================
 # eof
 #
@@ -60,22 +60,22 @@ def net():
     return net
 
 
-@pytest.fixture
+@pytest.fixture(scope='module')
 def color_dict():
     return {"m": "blue", "f": "red"}
 
 
-@pytest.fixture
+@pytest.fixture(scope='module')
 def shape_dict():
     return {"m": "circle", "f": "rectangle"}
 
 
-@pytest.fixture
+@pytest.fixture(scope='module')
 def style_dict():
     return {"m": "{shading=ball}", "f": None}
 
 
-@pytest.fixture
+@pytest.fixture(scope='module')
 def _layout():
     layout = {'a': (4.3191, -3.5352), 'b': (0.5292, -0.5292),
               'c': (8.6559, -3.8008), 'd': (12.4117, -7.5239),
@@ -92,11 +92,12 @@ def test_plot(net, _layout, color_dict):
 
     # plot(net, layout=layout, canvas=(8,8), margin=1) # plot_03.png
 
+    genders = {n: a['gender'] for n, a in net.nodes.items()}
+
     visual_style = {}
     visual_style['layout'] = _layout
     visual_style['node_size'] = .5
-    visual_style['node_color'] = {
-        n: color_dict[a['gender']]for n, a in net.nodes.items()}
+    visual_style['node_color'] = {n: color_dict[g] for n, g in genders.items()}
     visual_style['node_opacity'] = .7
     visual_style['node_label'] = {n: a['name'] for n, a in net.nodes.items()}
     visual_style['node_label_position'] = 'below'
@@ -117,22 +118,21 @@ def test_plot(net, _layout, color_dict):
 
 def test_plot_all_options(net, _layout, color_dict, shape_dict, style_dict):
 
+    genders = {n: a['gender'] for n, a in net.nodes.items()}
+
     visual_style = {}
     # node styles
     # -----------
     visual_style['node_size'] = 5
-    visual_style['node_color'] = {
-        n: color_dict[a['gender']]for n, a in net.nodes.items()}
+    visual_style['node_color'] = {n: color_dict[g] for n, g in genders.items()}
     visual_style['node_opacity'] = .7
     visual_style['node_label'] = {n: a['name'] for n, a in net.nodes.items()}
     visual_style['node_label_position'] = 'below'
     visual_style['node_label_distance'] = 15
     visual_style['node_label_color'] = 'gray'
     visual_style['node_label_size'] = 3
-    visual_style['node_shape'] = {
-        n: shape_dict[a['gender']]for n, a in net.nodes.items()}
-    visual_style['node_style'] = {
-        n: style_dict[a['gender']]for n, a in net.nodes.items()}
+    visual_style['node_shape'] = {n: shape_dict[g] for n, g in genders.items()}
+    visual_style['node_style'] = {n: style_dict[g] for n, g in genders.items()}
     visual_style['node_label_off'] = {'e': True}
     visual_style['node_math_mode'] = {'a': True}
     visual_style['node_label_as_id'] = {'f': True}